@@ -19,7 +19,7 @@ import pandas as pd
 import numpy as np
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Union, Any
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union, Any
 
 # ロガーの設定
 logger = logging.getLogger(__name__)
@@ -31,50 +31,174 @@ class AsymmetricAnalyzer:
     
     def __init__(self, 
                  pre_window: int = 5, 
-                 post_windows: List[int] = None):
+                 post_windows: List[int] = None,
+                 zigzag_times: Optional[np.ndarray] = None):
         """
         初期化
         
         Args:
             pre_window: 発表前の分析時間（分）
             post_windows: 発表後の分析時間枠のリスト（分）。デフォルトは[5, 15, 30]
+            zigzag_times: 昇順に並んだZigZagデータの時刻（int64ナノ秒）。
+                get_zigzag_time_columnで選ばれる列から作成する。
+                指定した場合は時間ウィンドウの抽出に二分探索を使用する
         """
         self.pre_window = pre_window
         self.post_windows = post_windows if post_windows else [5, 15, 30]
+        self.zigzag_times = zigzag_times
         logger.info(f"AsymmetricAnalyzer initialized with pre_window={pre_window}, "
                    f"post_windows={self.post_windows}")
     
+    def compute_window_bounds(self,
+                              event_times: pd.Series,
+                              zigzag_times: Optional[np.ndarray] = None) -> Optional[Dict]:
+        """
+        全指標の時間ウィンドウに対応するZigZagデータの行範囲を一括で計算する
+        
+        ウィンドウの種類ごとに開始位置と終了位置の配列（列指向の補助データ）を返し、
+        指標ごとの抽出を全行の比較ではなく位置による切り出しで行えるようにする。
+        範囲は呼び出し側が保持して各分析に渡す（インスタンスには保存しない）。
+        
+        Args:
+            event_times: 指標の発表時刻（指標の並び順）
+            zigzag_times: 昇順に並んだZigZagデータの時刻（int64ナノ秒）。Noneの場合はself.zigzag_times
+            
+        Returns:
+            dict: ウィンドウの種類（'pre', 'last_min'または発表後の分数）ごとの(開始位置, 終了位置)、
+                対応するZigZagデータの行数（'num_rows'）、一括変換できた指標のフラグ（'valid'）。
+                時刻配列がない場合や発表時刻をまとめて変換できない場合はNone
+        """
+        if zigzag_times is None:
+            zigzag_times = self.zigzag_times
+        if zigzag_times is None:
+            return None
+        
+        # 変換できない発表時刻はNaTにする（その指標だけ行ごとの処理に回し、バッチ全体は止めない）
+        try:
+            event_dt = pd.to_datetime(event_times, errors='coerce')
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Could not convert event times for window bounds, extracting per indicator: {e}")
+            return None
+        
+        event_ns = pd.Series(event_dt).to_numpy(dtype='datetime64[ns]').view('i8')
+        valid = ~np.isnat(event_ns.view('datetime64[ns]'))
+        minute_ns = pd.Timedelta(minutes=1).value
+        
+        def bounds(start_offset: int, end_offset: int) -> Tuple[np.ndarray, np.ndarray]:
+            # 発表時刻がNaTの指標は空のウィンドウとする
+            lo = np.searchsorted(zigzag_times, event_ns + start_offset, side='left')
+            hi = np.searchsorted(zigzag_times, event_ns + end_offset, side='right')
+            return np.where(valid, lo, 0), np.where(valid, hi, 0)
+        
+        window_bounds = {
+            'num_rows': len(zigzag_times),
+            'valid': valid,
+            'pre': bounds(-self.pre_window * minute_ns, 0),
+            'last_min': bounds(-minute_ns, 0)
+        }
+        for minutes in self.post_windows:
+            window_bounds[minutes] = bounds(0, minutes * minute_ns)
+        return window_bounds
+    
+    def validate_zigzag_times(self, zigzag_df: pd.DataFrame) -> None:
+        """
+        zigzag_timesがzigzag_dfの時間列と対応しているか確認する
+        
+        行数と、get_zigzag_time_columnで選んだ時間列の先頭・末尾の時刻を比較する。
+        
+        Args:
+            zigzag_df: ZigZagデータのDataFrame
+            
+        Raises:
+            ValueError: 行数または時刻が一致しない場合
+        """
+        if self.zigzag_times is None:
+            return
+        
+        if len(zigzag_df) != len(self.zigzag_times):
+            raise ValueError(f"zigzag_df has {len(zigzag_df)} rows but zigzag_times has "
+                             f"{len(self.zigzag_times)}")
+        if len(zigzag_df) == 0:
+            return
+        
+        time_col = get_zigzag_time_column(zigzag_df)
+        if time_col is None or not pd.api.types.is_datetime64_any_dtype(zigzag_df[time_col]):
+            raise ValueError("zigzag_df has no datetime column matching zigzag_times")
+        
+        times = zigzag_df[time_col]
+        endpoints = np.array([pd.Timestamp(times.iloc[0]).value, pd.Timestamp(times.iloc[-1]).value])
+        if not np.array_equal(endpoints, self.zigzag_times[[0, -1]]):
+            raise ValueError(f"zigzag_times does not match zigzag_df['{time_col}']")
+    
+    def _extract_window(self,
+                        zigzag_df: pd.DataFrame,
+                        start_time: pd.Timestamp,
+                        end_time: pd.Timestamp,
+                        window_key: Union[str, int],
+                        position: Optional[int] = None,
+                        window_bounds: Optional[Dict] = None) -> pd.DataFrame:
+        """
+        時間ウィンドウ内のZigZagデータを抽出する
+        
+        Args:
+            zigzag_df: ZigZagデータのDataFrame
+            start_time: 開始時刻
+            end_time: 終了時刻
+            window_key: window_boundsのキー（'pre', 'last_min'または発表後の分数）
+            position: compute_window_boundsに渡した指標の位置。Noneの場合は時刻で抽出
+            window_bounds: compute_window_boundsの戻り値。Noneの場合や、
+                その指標の発表時刻を一括変換できなかった場合は時刻で抽出
+            
+        Returns:
+            DataFrame: 抽出されたZigZagデータ
+        """
+        if position is not None and window_bounds is not None:
+            # 計算済みの範囲は時刻配列の行位置なので、別のデータには適用しない
+            if len(zigzag_df) != window_bounds['num_rows']:
+                raise ValueError(f"zigzag_df has {len(zigzag_df)} rows but window bounds were computed "
+                                 f"for {window_bounds['num_rows']}")
+            if window_bounds['valid'][position]:
+                lo, hi = window_bounds[window_key]
+                return zigzag_df.iloc[lo[position]:hi[position]]
+        
+        return extract_zigzag_window(zigzag_df, start_time, end_time, sorted_times=self.zigzag_times)
+    
     def analyze_pre_event(self, 
-                          indicator_row: pd.Series, 
-                          zigzag_df: pd.DataFrame) -> Dict[str, Any]:
+                          indicator_row: Union[pd.Series, NamedTuple], 
+                          zigzag_df: pd.DataFrame,
+                          position: Optional[int] = None,
+                          window_bounds: Optional[Dict] = None) -> Dict[str, Any]:
         """
         指標発表前の分析を行う
         
         Args:
-            indicator_row: 分析対象の経済指標行（Series）
+            indicator_row: 分析対象の経済指標行（SeriesまたはitertuplesのNamedTuple）
             zigzag_df: ZigZagデータのDataFrame
+            position: compute_window_boundsに渡した指標の位置（指定時は計算済みの範囲で抽出）
+            window_bounds: compute_window_boundsの戻り値（positionと併せて指定）
             
         Returns:
             dict: 発表前分析の結果
         """
         try:
             # 指標発表時刻を取得
+            indicator_row = _row_to_mapping(indicator_row)
             if 'DateTime_UTC' in indicator_row:
                 event_time = pd.to_datetime(indicator_row['DateTime_UTC'])
             else:
                 # 代替カラム名を確認
-                datetime_cols = [col for col in indicator_row.index if 'datetime' in col.lower() or 'time' in col.lower()]
+                datetime_cols = [col for col in indicator_row.keys() if 'datetime' in col.lower() or 'time' in col.lower()]
                 if datetime_cols:
                     event_time = pd.to_datetime(indicator_row[datetime_cols[0]])
                 else:
-                    logger.error(f"No datetime column found in indicator row: {indicator_row.index.tolist()}")
+                    logger.error(f"No datetime column found in indicator row: {list(indicator_row.keys())}")
                     return {'pre_event_valid': False, 'error': 'No datetime column found'}
             
             # 発表前の時間ウィンドウを設定
             pre_start = event_time - pd.Timedelta(minutes=self.pre_window)
             
             # 該当期間のZigZagデータを抽出
-            pre_data = extract_zigzag_window(zigzag_df, pre_start, event_time)
+            pre_data = self._extract_window(zigzag_df, pre_start, event_time, 'pre', position, window_bounds)
             
             # データが2ポイント以上ない場合は有効な結果が計算できない
             if len(pre_data) < 2:
@@ -103,7 +227,8 @@ class AsymmetricAnalyzer:
             
             # 発表直前1分間の特別分析（可能な場合）
             last_minute_start = event_time - pd.Timedelta(minutes=1)
-            last_minute_data = extract_zigzag_window(zigzag_df, last_minute_start, event_time)
+            last_minute_data = self._extract_window(zigzag_df, last_minute_start, event_time,
+                                                    'last_min', position, window_bounds)
             if len(last_minute_data) >= 2:
                 last_min_movement = calculate_price_movement(last_minute_data)
                 # キー名を変更して追加
@@ -117,29 +242,34 @@ class AsymmetricAnalyzer:
             return {'pre_event_valid': False, 'error': str(e)}
     
     def analyze_post_event(self, 
-                           indicator_row: pd.Series, 
-                           zigzag_df: pd.DataFrame) -> Dict[str, Any]:
+                           indicator_row: Union[pd.Series, NamedTuple], 
+                           zigzag_df: pd.DataFrame,
+                           position: Optional[int] = None,
+                           window_bounds: Optional[Dict] = None) -> Dict[str, Any]:
         """
         指標発表後の複数時間枠での分析を行う
         
         Args:
-            indicator_row: 分析対象の経済指標行（Series）
+            indicator_row: 分析対象の経済指標行（SeriesまたはitertuplesのNamedTuple）
             zigzag_df: ZigZagデータのDataFrame
+            position: compute_window_boundsに渡した指標の位置（指定時は計算済みの範囲で抽出）
+            window_bounds: compute_window_boundsの戻り値（positionと併せて指定）
             
         Returns:
             dict: 発表後分析の結果（時間枠ごと）
         """
         try:
             # 指標発表時刻を取得
+            indicator_row = _row_to_mapping(indicator_row)
             if 'DateTime_UTC' in indicator_row:
                 event_time = pd.to_datetime(indicator_row['DateTime_UTC'])
             else:
                 # 代替カラム名を確認
-                datetime_cols = [col for col in indicator_row.index if 'datetime' in col.lower() or 'time' in col.lower()]
+                datetime_cols = [col for col in indicator_row.keys() if 'datetime' in col.lower() or 'time' in col.lower()]
                 if datetime_cols:
                     event_time = pd.to_datetime(indicator_row[datetime_cols[0]])
                 else:
-                    logger.error(f"No datetime column found in indicator row: {indicator_row.index.tolist()}")
+                    logger.error(f"No datetime column found in indicator row: {list(indicator_row.keys())}")
                     return {'post_event_valid': False, 'error': 'No datetime column found'}
             
             results = {'post_event_valid': True}
@@ -150,7 +280,7 @@ class AsymmetricAnalyzer:
                 post_end = event_time + pd.Timedelta(minutes=minutes)
                 
                 # 該当期間のZigZagデータを抽出
-                post_data = extract_zigzag_window(zigzag_df, event_time, post_end)
+                post_data = self._extract_window(zigzag_df, event_time, post_end, minutes, position, window_bounds)
                 
                 # 時間枠ごとの結果用辞書
                 window_key = f'post_{minutes}min'
@@ -258,23 +388,29 @@ class AsymmetricAnalyzer:
         return ratios
     
     def analyze_indicator(self, 
-                          indicator_row: pd.Series, 
-                          zigzag_df: pd.DataFrame) -> Dict[str, Any]:
+                          indicator_row: Union[pd.Series, NamedTuple], 
+                          zigzag_df: pd.DataFrame,
+                          position: Optional[int] = None,
+                          window_bounds: Optional[Dict] = None) -> Dict[str, Any]:
         """
         指標に対する完全な分析（発表前、発表後、比率計算）を実行
         
         Args:
-            indicator_row: 分析対象の経済指標行（Series）
+            indicator_row: 分析対象の経済指標行（SeriesまたはitertuplesのNamedTuple）
             zigzag_df: ZigZagデータのDataFrame
+            position: compute_window_boundsに渡した指標の位置（指定時は計算済みの範囲で抽出）
+            window_bounds: compute_window_boundsの戻り値（positionと併せて指定）
             
         Returns:
             dict: 統合された分析結果
         """
+        indicator_row = _row_to_mapping(indicator_row)
+        
         # 発表前分析
-        pre_results = self.analyze_pre_event(indicator_row, zigzag_df)
+        pre_results = self.analyze_pre_event(indicator_row, zigzag_df, position, window_bounds)
         
         # 発表後分析
-        post_results = self.analyze_post_event(indicator_row, zigzag_df)
+        post_results = self.analyze_post_event(indicator_row, zigzag_df, position, window_bounds)
         
         # 結果を統合
         combined_results = {}
@@ -294,9 +430,104 @@ class AsymmetricAnalyzer:
         return combined_results
 
 
+def _row_to_mapping(indicator_row: Union[pd.Series, NamedTuple]) -> Union[pd.Series, Dict[str, Any]]:
+    """
+    指標行を列名でアクセスできる形式にそろえる
+    
+    Args:
+        indicator_row: SeriesまたはitertuplesのNamedTuple
+        
+    Returns:
+        Series or dict: Seriesはそのまま、NamedTupleは列名をキーとする辞書
+    """
+    if isinstance(indicator_row, tuple) and hasattr(indicator_row, '_asdict'):
+        return indicator_row._asdict()
+    return indicator_row
+
+
+def get_zigzag_time_column(zigzag_df: pd.DataFrame) -> Optional[str]:
+    """
+    時間ウィンドウの抽出に使うZigZagデータの時間列を選ぶ
+    
+    名前に'time'または'date'を含む列のうち、datetime型の列を優先する
+    （start_time_utc_secondsのような数値列よりstart_time_dtを使う）。
+    
+    Args:
+        zigzag_df: ZigZagデータのDataFrame
+        
+    Returns:
+        str: 時間列の名前（見つからない場合はNone）
+    """
+    time_cols = [col for col in zigzag_df.columns if 'time' in col.lower() or 'date' in col.lower()]
+    if not time_cols:
+        return None
+    
+    datetime_cols = [col for col in time_cols if pd.api.types.is_datetime64_any_dtype(zigzag_df[col])]
+    return datetime_cols[0] if datetime_cols else time_cols[0]
+
+
+def _parse_event_times(event_times: pd.Series) -> Optional[pd.Series]:
+    """
+    指標の発表時刻をまとめてdatetime型に変換する（変換できない値はNaT）
+    
+    Args:
+        event_times: 指標の発表時刻
+        
+    Returns:
+        Series: 変換後の発表時刻。タイムゾーンの混在などで一括変換できない場合はNone
+    """
+    try:
+        return pd.Series(pd.to_datetime(event_times, errors='coerce'))
+    except (TypeError, ValueError) as e:
+        logger.warning(f"Could not convert event times in bulk, extracting per indicator: {e}")
+        return None
+
+
+def _sorted_zigzag_times(zigzag_df: pd.DataFrame,
+                         event_times: Optional[pd.Series],
+                         zigzag_times: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+    """
+    計算済みのウィンドウ範囲に使うZigZagデータの時刻配列を決める
+    
+    zigzag_timesが渡されたかどうかによらず同じ規則で判定し、指標ごとに時刻で抽出した
+    場合と同じ比較になるときだけ時刻配列を返す。時刻による抽出ではタイムゾーン付きと
+    タイムゾーンなしの時刻は比較できないため、その組み合わせでは範囲を使わない。
+    並び順の確認は全行の走査になるため、データごとに一度だけ呼び出す。
+    
+    Args:
+        zigzag_df: ZigZagデータのDataFrame
+        event_times: _parse_event_timesで変換した指標の発表時刻（Noneの場合は範囲を使わない）
+        zigzag_times: analyzerに渡された昇順の時刻配列（validate_zigzag_timesで確認済み）。
+            Noneの場合はzigzag_dfが時刻順かどうかを確認して作成する
+        
+    Returns:
+        ndarray: get_zigzag_time_columnで選ばれる列の時刻（int64ナノ秒）。
+            datetime型でない場合、発表時刻とタイムゾーンの有無が異なる場合、昇順でない場合はNone
+    """
+    if event_times is None:
+        return None
+    
+    time_col = get_zigzag_time_column(zigzag_df)
+    if time_col is None:
+        return None
+    
+    times = zigzag_df[time_col]
+    if not pd.api.types.is_datetime64_any_dtype(times):
+        return None
+    if (getattr(times.dtype, 'tz', None) is None) != (getattr(event_times.dtype, 'tz', None) is None):
+        return None
+    
+    if zigzag_times is not None:
+        return zigzag_times
+    if not times.is_monotonic_increasing:
+        return None
+    return times.to_numpy(dtype='datetime64[ns]').view('i8')
+
+
 def extract_zigzag_window(zigzag_df: pd.DataFrame, 
                          start_time: pd.Timestamp, 
-                         end_time: pd.Timestamp) -> pd.DataFrame:
+                         end_time: pd.Timestamp,
+                         sorted_times: Optional[np.ndarray] = None) -> pd.DataFrame:
     """
     指定された時間ウィンドウ内のZigZagデータを抽出する
     
@@ -304,23 +535,35 @@ def extract_zigzag_window(zigzag_df: pd.DataFrame,
         zigzag_df: ZigZagデータのDataFrame
         start_time: 開始時刻
         end_time: 終了時刻
+        sorted_times: zigzag_dfの行順に対応する昇順の時刻（int64ナノ秒、
+            get_zigzag_time_columnで選ばれる列から作成）。
+            指定した場合は全行の比較の代わりに二分探索で範囲を求める
         
     Returns:
         DataFrame: 抽出されたZigZagデータ
     """
     try:
-        # 時間列の特定
-        time_cols = [col for col in zigzag_df.columns if 'time' in col.lower() or 'date' in col.lower()]
+        # 時間列の特定（zigzag_timesを作る側と同じ規則で選ぶ）
+        time_col = get_zigzag_time_column(zigzag_df)
         
-        if not time_cols:
+        if time_col is None:
             logger.error("No time column found in zigzag dataframe")
             return pd.DataFrame()
         
-        time_col = time_cols[0]
-        
-        # 時間列がdatetimeタイプでない場合は変換
+        # ソート済みの時刻配列がある場合は二分探索で範囲を求めて切り出す
+        # （タイムゾーンの有無が時間列と異なる時刻は比較できないため、下の比較と同じ扱いにする）
+        if sorted_times is not None and len(sorted_times) == len(zigzag_df):
+            start_ts = pd.Timestamp(start_time)
+            end_ts = pd.Timestamp(end_time)
+            col_tz = getattr(zigzag_df[time_col].dtype, 'tz', None)
+            if (col_tz is None) == (start_ts.tz is None) == (end_ts.tz is None):
+                lo = np.searchsorted(sorted_times, start_ts.value, side='left')
+                hi = np.searchsorted(sorted_times, end_ts.value, side='right')
+                return zigzag_df.iloc[lo:hi].copy()
+        
+        # 時間列がdatetimeタイプでない場合は変換（呼び出し元のデータは変更しない）
         if not pd.api.types.is_datetime64_any_dtype(zigzag_df[time_col]):
-            zigzag_df[time_col] = pd.to_datetime(zigzag_df[time_col])
+            zigzag_df = zigzag_df.assign(**{time_col: pd.to_datetime(zigzag_df[time_col])})
         
         # 時間ウィンドウ内のデータを抽出
         window_data = zigzag_df[(zigzag_df[time_col] >= start_time) & 
@@ -507,12 +750,24 @@ def batch_process_indicators(indicators_df: pd.DataFrame,
     
     logger.info(f"Starting batch processing of {total_indicators} indicators")
     
+    # ソート済みの時刻配列がある場合は全指標のウィンドウ範囲をまとめて計算
+    # （範囲はこの呼び出しの指標とZigZagデータにだけ対応するため、analyzerには保存しない。
+    #  時刻配列の有無によらず、使えるかどうかは_sorted_zigzag_timesの同じ規則で判定する）
+    window_bounds = None
+    if 'DateTime_UTC' in indicators_df.columns:
+        if analyzer.zigzag_times is not None:
+            analyzer.validate_zigzag_times(zigzag_df)
+        event_times = _parse_event_times(indicators_df['DateTime_UTC'])
+        zigzag_times = _sorted_zigzag_times(zigzag_df, event_times, analyzer.zigzag_times)
+        if zigzag_times is not None:
+            window_bounds = analyzer.compute_window_bounds(event_times, zigzag_times)
+    
     for idx, (_, indicator_row) in enumerate(indicators_df.iterrows()):
         if idx % 100 == 0:
             logger.info(f"Processing indicator {idx+1}/{total_indicators}")
         
         # 指標の分析を実行
-        analysis_result = analyzer.analyze_indicator(indicator_row, zigzag_df)
+        analysis_result = analyzer.analyze_indicator(indicator_row, zigzag_df, idx, window_bounds)
         results.append(analysis_result)
     
     logger.info(f"Completed batch processing of {total_indicators} indicators")
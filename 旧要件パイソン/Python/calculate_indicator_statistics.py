@@ -9,6 +9,7 @@ import seaborn as sns
 INPUT_PATH = "../csv/MergedData/indicators_with_volatility.csv"
 OUTPUT_PATH = "../csv/Statistics/indicator_statistics.csv"
 CATEGORY_OUTPUT_PATH = "../csv/Statistics/category_statistics.csv"
+CURRENCY_OUTPUT_PATH = "../csv/Statistics/currency_mean_volatility.csv"
 PLOTS_DIR = "../plots"
 
 def main():
@@ -52,9 +53,8 @@ def main():
     stats = stats.reset_index()
     
     # 小数点以下の桁数を制限
-    float_cols = [col for col in stats.columns if stats[col].dtype == 'float64']
-    for col in float_cols:
-        stats[col] = stats[col].round(3)
+    float_cols = stats.select_dtypes(include=['floating']).columns.tolist()
+    stats[float_cols] = stats[float_cols].round(3)
     
     # データ件数でフィルタリング（サンプル数が少ない指標は除外）
     min_samples = 5
@@ -88,6 +88,9 @@ def main():
     category_stats.columns = ['_'.join(col).strip() for col in category_stats.columns.values]
     category_stats = category_stats.reset_index()
     
+    # 通貨別の平均ボラティリティ（アプリ表示用に事前集計）
+    currency_volatility = stats_filtered.groupby('Currency')['PriceMovement_mean'].mean().sort_values(ascending=False)
+    
     # 出力ディレクトリの作成
     output_dir = Path(OUTPUT_PATH).parent
     plots_dir = Path(PLOTS_DIR)
@@ -101,16 +104,17 @@ def main():
     # 結果の保存
     stats_filtered.to_csv(OUTPUT_PATH, index=False)
     category_stats.to_csv(CATEGORY_OUTPUT_PATH, index=False)
+    currency_volatility.reset_index().to_csv(CURRENCY_OUTPUT_PATH, index=False)
     
     print(f"Statistics saved to {OUTPUT_PATH}")
     print(f"Category statistics saved to {CATEGORY_OUTPUT_PATH}")
+    print(f"Currency mean volatility saved to {CURRENCY_OUTPUT_PATH}")
     
     # デバッグ用：データの一部をプレビュー表示
     print("\n===== データプレビュー =====")
     
     # 通貨別の平均ボラティリティ
     print("\n1. 通貨別の平均ボラティリティ:")
-    currency_volatility = stats_filtered.groupby('Currency')['PriceMovement_mean'].mean().sort_values(ascending=False)
     for currency, mean in currency_volatility.items():
         print(f"{currency}: {mean:.3f}")
     
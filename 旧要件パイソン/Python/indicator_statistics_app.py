@@ -9,18 +9,40 @@ from PIL import Image
 # 入力ファイルパス設定
 INDICATOR_STATS_PATH = "../csv/Statistics/indicator_statistics.csv"
 CATEGORY_STATS_PATH = "../csv/Statistics/category_statistics.csv"
+CURRENCY_VOLATILITY_PATH = "../csv/Statistics/currency_mean_volatility.csv"
 PLOTS_DIR = "../plots"
 
+# アプリが参照する列（calculate_indicator_statistics.pyの出力スキーマ）
+INDICATOR_STATS_COLUMNS = ['Currency', 'EventName', 'PriceMovement_mean', 'PriceMovement_count', 'Volatility_Category']
+CATEGORY_STATS_COLUMNS = ['Volatility_Category', 'PriceMovement_mean_count']
+CURRENCY_VOLATILITY_COLUMNS = ['Currency', 'PriceMovement_mean']
+
+def read_frame(path, required_columns):
+    """CSVファイルを読み込み、アプリが参照する列がそろっているか確認する
+    （同じディレクトリに別スキーマの同名ファイルが出力されている場合を検出）"""
+    df = pd.read_csv(path)
+    missing_cols = [col for col in required_columns if col not in df.columns]
+    if missing_cols:
+        raise ValueError(f"{path} is missing columns {missing_cols}; "
+                         f"regenerate it with calculate_indicator_statistics.py")
+    return df
+
 def load_data():
     """データの読み込み"""
     try:
-        indicator_stats = pd.read_csv(INDICATOR_STATS_PATH)
-        category_stats = pd.read_csv(CATEGORY_STATS_PATH)
+        indicator_stats = read_frame(INDICATOR_STATS_PATH, INDICATOR_STATS_COLUMNS)
+        category_stats = read_frame(CATEGORY_STATS_PATH, CATEGORY_STATS_COLUMNS)
         return indicator_stats, category_stats
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return None, None
 
+def load_currency_volatility(indicator_stats):
+    """通貨別平均ボラティリティの読み込み（事前集計ファイルがない場合はその場で集計）"""
+    if os.path.exists(CURRENCY_VOLATILITY_PATH):
+        return read_frame(CURRENCY_VOLATILITY_PATH, CURRENCY_VOLATILITY_COLUMNS).set_index('Currency')
+    return indicator_stats.groupby('Currency')['PriceMovement_mean'].mean().sort_values(ascending=False).to_frame()
+
 def plot_volatility_distribution(data):
     """ボラティリティ分布のプロット"""
     fig, ax = plt.subplots(figsize=(10, 6))
@@ -188,20 +210,16 @@ def main():
     
     # 通貨別の平均ボラティリティ
     st.subheader("通貨別の平均ボラティリティ")
-    currency_volatility = indicator_stats.groupby('Currency')['PriceMovement_mean'].mean().sort_values(ascending=False)
-    
-    fig, ax = plt.subplots(figsize=(12, 6))
-    currency_volatility.plot(kind='bar', ax=ax)
-    ax.set_title('Average Volatility by Currency')
-    ax.set_ylabel('Mean Volatility')
-    st.pyplot(fig)
+    currency_volatility = load_currency_volatility(indicator_stats)
+    st.bar_chart(currency_volatility)
     
-    # カテゴリ別の指標数分布
+    # カテゴリ別の指標数分布（カテゴリ統計の件数列を使用）
     st.subheader("カテゴリ別の指標数分布")
-    category_counts = indicator_stats['Volatility_Category'].value_counts()
+    category_counts = category_stats.set_index('Volatility_Category')['PriceMovement_mean_count']
     
     fig, ax = plt.subplots(figsize=(8, 6))
     category_counts.plot(kind='pie', autopct='%1.1f%%', ax=ax)
+    ax.set_ylabel('')
     ax.set_title('Distribution of Indicators by Volatility Category')
     st.pyplot(fig)
     
@@ -20,6 +20,7 @@ import argparse
 import logging
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Union, Any
@@ -28,6 +29,8 @@ from typing import Dict, List, Optional, Tuple, Union, Any
 from asymmetric_analysis import AsymmetricAnalyzer, batch_process_indicators
 from statistical_processor import StatisticalProcessor
 from multiscale_analysis import MultiscaleAnalyzer
+from process_indicators import (load_indicator_data as process_load_indicators,
+                                load_zigzag_data as process_load_zigzag, write_parquet)
 
 # ロガーの設定
 logger = logging.getLogger(__name__)
@@ -104,7 +107,7 @@ def parse_arguments():
 
 def load_indicator_data(file_path: str) -> pd.DataFrame:
     """
-    経済指標データをCSVファイルから読み込む
+    経済指標データをCSVファイルから読み込む（process_indicatorsの読み込み処理を使用）
     
     Args:
         file_path: 経済指標CSVファイルのパス
@@ -112,36 +115,11 @@ def load_indicator_data(file_path: str) -> pd.DataFrame:
     Returns:
         DataFrame: 読み込まれた経済指標データ
     """
-    try:
-        logger.info(f"Loading indicator data from {file_path}")
-        
-        # エンコーディングの問題に対応するためにいくつかのエンコーディングを試す
-        encodings = ['utf-8', 'cp932', 'shift-jis', 'latin1']
-        df_indicators = None
-        
-        for encoding in encodings:
-            try:
-                df_indicators = pd.read_csv(file_path, encoding=encoding)
-                logger.info(f"Successfully loaded indicators with encoding: {encoding}")
-                break
-            except UnicodeDecodeError:
-                logger.warning(f"Failed to load with encoding: {encoding}")
-                continue
-        
-        if df_indicators is None:
-            logger.error(f"Failed to load indicators with any of the tried encodings")
-            return pd.DataFrame()
-        
-        logger.info(f"Loaded {len(df_indicators)} indicator records")
-        return df_indicators
-    
-    except Exception as e:
-        logger.error(f"Error loading indicator data: {e}")
-        return pd.DataFrame()
+    return process_load_indicators(file_path)
 
 def load_zigzag_data(path: str) -> pd.DataFrame:
     """
-    ZigZagデータを読み込む（ディレクトリまたは単一ファイル）
+    ZigZagデータを読み込む（ディレクトリまたは単一ファイル、process_indicatorsの読み込み処理を使用）
     
     Args:
         path: ZigZagデータファイルまたはディレクトリのパス
@@ -149,47 +127,7 @@ def load_zigzag_data(path: str) -> pd.DataFrame:
     Returns:
         DataFrame: 読み込まれたZigZagデータ
     """
-    try:
-        from process_indicators import load_zigzag_data as process_load_zigzag
-        return process_load_zigzag(path)
-    except ImportError:
-        logger.error("Failed to import process_indicators module, using simplified ZigZag loading")
-        
-        try:
-            # ディレクトリの場合は単一ファイルを読み込む
-            if os.path.isdir(path):
-                logger.info(f"Loading ZigZag data from directory (first file only): {path}")
-                zigzag_files = [os.path.join(path, f) for f in os.listdir(path) if f.endswith('.csv')]
-                if not zigzag_files:
-                    logger.error(f"No CSV files found in {path}")
-                    return pd.DataFrame()
-                file_path = zigzag_files[0]
-            else:
-                # 単一ファイルの場合
-                logger.info(f"Loading ZigZag data from file: {path}")
-                file_path = path
-            
-            # ファイルを読み込む
-            try:
-                df_zigzag = pd.read_csv(file_path, sep='\t')
-                
-                # 時間列を変換
-                if 'start_time_utc_seconds' in df_zigzag.columns:
-                    df_zigzag['start_time_dt'] = pd.to_datetime(df_zigzag['start_time_utc_seconds'], unit='s')
-                
-                if 'end_time_utc_seconds' in df_zigzag.columns:
-                    df_zigzag['end_time_dt'] = pd.to_datetime(df_zigzag['end_time_utc_seconds'], unit='s')
-                
-                logger.info(f"Loaded {len(df_zigzag)} ZigZag records")
-                return df_zigzag
-                
-            except Exception as e:
-                logger.error(f"Error reading {file_path}: {e}")
-                return pd.DataFrame()
-            
-        except Exception as e:
-            logger.error(f"Error loading ZigZag data: {e}")
-            return pd.DataFrame()
+    return process_load_zigzag(path)
 
 def ensure_directory(directory_path: str) -> bool:
     """
@@ -211,9 +149,9 @@ def ensure_directory(directory_path: str) -> bool:
         logger.error(f"Failed to create directory {directory_path}: {e}")
         return False
 
-def save_dataframe(df: pd.DataFrame, output_path: str, index: bool = False) -> bool:
+def save_frame(df: pd.DataFrame, output_path: str, index: bool = False) -> bool:
     """
-    DataFrameをCSVファイルとして保存する
+    DataFrameをParquetファイルとして保存する（拡張子が.csvの場合はCSVで保存）
     
     Args:
         df: 保存するDataFrame
@@ -228,13 +166,41 @@ def save_dataframe(df: pd.DataFrame, output_path: str, index: bool = False) -> b
             logger.warning(f"DataFrame is empty, not saving to {output_path}")
             return False
         
-        df.to_csv(output_path, index=index)
+        if output_path.endswith('.csv'):
+            # 後方互換のためCSV出力も残す
+            df.to_csv(output_path, index=index)
+        else:
+            write_parquet(df, output_path, index=index)
         logger.info(f"Saved DataFrame to {output_path} ({len(df)} records)")
         return True
     except Exception as e:
         logger.error(f"Error saving DataFrame to {output_path}: {e}")
         return False
 
+def process_window_statistics(analyzed_df: pd.DataFrame,
+                              window: int,
+                              min_samples: int,
+                              classification_method: str) -> Tuple[int, pd.DataFrame, pd.DataFrame]:
+    """
+    単一の時間枠に対して統計処理を実行する（プロセスプールのワーカー用）
+    
+    Args:
+        analyzed_df: 分析済みの指標データ
+        window: 発表後の時間枠（分）
+        min_samples: 統計計算に必要な最小サンプル数
+        classification_method: 分類方法
+        
+    Returns:
+        Tuple[int, DataFrame, DataFrame]: (時間枠, 指標統計量, カテゴリ統計量)
+    """
+    target_column = f"post_{window}min_price_movement"
+    processor = StatisticalProcessor(min_samples=min_samples, target_column=target_column)
+    stats_df, category_stats_df = processor.process_analyzed_data(
+        analyzed_df, 
+        classification_method=classification_method
+    )
+    return window, stats_df, category_stats_df
+
 def run_integrated_analysis(args) -> int:
     """
     統合分析を実行する
@@ -274,8 +240,8 @@ def run_integrated_analysis(args) -> int:
         
         # 分析結果の保存
         if not analyzed_df.empty:
-            analyzed_output_path = os.path.join(args.output_dir, "analyzed_indicators.csv")
-            save_dataframe(analyzed_df, analyzed_output_path, index=False)
+            analyzed_output_path = os.path.join(args.output_dir, "analyzed_indicators.parquet")
+            save_frame(analyzed_df, analyzed_output_path, index=False)
         else:
             logger.error("Asymmetric analysis failed to produce results")
             return 1
@@ -284,25 +250,26 @@ def run_integrated_analysis(args) -> int:
     if args.run_statistical and analyzed_df is not None:
         logger.info("Running statistical processing")
         
-        # 各時間枠に対して統計処理を実行
-        for window in post_windows:
-            target_column = f"post_{window}min_price_movement"
-            
-            # 統計処理の実行
-            processor = StatisticalProcessor(min_samples=args.min_samples, target_column=target_column)
-            stats_df, category_stats_df = processor.process_analyzed_data(
-                analyzed_df, 
-                classification_method=args.classification_method
+        # 各時間枠の統計処理は互いに独立しているため、プロセスプールで並列に実行
+        max_workers = min(len(post_windows), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            window_results = executor.map(
+                process_window_statistics,
+                [analyzed_df] * len(post_windows),
+                post_windows,
+                [args.min_samples] * len(post_windows),
+                [args.classification_method] * len(post_windows)
             )
             
-            # 統計結果の保存
-            if not stats_df.empty:
-                stats_output_path = os.path.join(args.output_dir, f"indicator_statistics_{window}min.csv")
-                save_dataframe(stats_df, stats_output_path, index=False)
-            
-            if not category_stats_df.empty:
-                category_output_path = os.path.join(args.output_dir, f"category_statistics_{window}min.csv")
-                save_dataframe(category_stats_df, category_output_path, index=False)
+            for window, stats_df, category_stats_df in window_results:
+                # 統計結果の保存
+                if not stats_df.empty:
+                    stats_output_path = os.path.join(args.output_dir, f"indicator_statistics_{window}min.parquet")
+                    save_frame(stats_df, stats_output_path, index=False)
+                
+                if not category_stats_df.empty:
+                    category_output_path = os.path.join(args.output_dir, f"category_statistics_{window}min.parquet")
+                    save_frame(category_stats_df, category_output_path, index=False)
     
     # 3. マルチスケール分析を実行
     if args.run_multiscale and analyzed_df is not None:
@@ -315,8 +282,8 @@ def run_integrated_analysis(args) -> int:
         # 結果の保存
         for result_name, result_df in multiscale_results.items():
             if not result_df.empty:
-                output_path = os.path.join(args.output_dir, f"multiscale_{result_name}.csv")
-                save_dataframe(result_df, output_path, index=(result_name == 'scale_correlations'))
+                output_path = os.path.join(args.output_dir, f"multiscale_{result_name}.parquet")
+                save_frame(result_df, output_path, index=(result_name == 'scale_correlations'))
     
     logger.info("Integrated analysis completed successfully")
     return 0
@@ -0,0 +1,24 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+JITコンパイル補助モジュール
+
+このモジュールは、数値計算カーネルをnumbaでJITコンパイルするためのデコレータを
+各分析モジュールに共通で提供します。numbaが利用できない環境では、同じ関数を
+通常のPython関数として実行するフォールバックに切り替わります。
+
+主な機能:
+- njitデコレータ（numbaが無い場合は何もしない）
+- prange（numbaが無い場合は組み込みのrange）
+"""
+
+try:
+    from numba import njit, prange
+except ImportError:
+    # numbaが利用できない環境では通常のPython関数として実行する
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+    prange = range
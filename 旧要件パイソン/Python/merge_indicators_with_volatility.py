@@ -60,6 +60,19 @@ def main():
         df_indicators['DateTime_UTC'] = pd.to_datetime(df_indicators['DateTime (UTC)'], 
                                                        format='%Y.%m.%d %H:%M:%S')
         
+        # 派生列を作る前に、マージで使われない行を除外して処理対象を絞り込む
+        # 通貨が欠損している行を除外
+        if 'Currency' in df_indicators.columns:
+            df_indicators = df_indicators.dropna(subset=['Currency'])
+        
+        # ボラティリティデータの日付範囲外の行を除外（JST = UTC + 9時間）
+        volatility_dates = pd.to_datetime(df_volatility['Date_JST'], format='%Y-%m-%d')
+        range_start = volatility_dates.min() - pd.Timedelta(hours=9)
+        range_end = volatility_dates.max() + pd.Timedelta(days=1) - pd.Timedelta(hours=9)
+        df_indicators = df_indicators[(df_indicators['DateTime_UTC'] >= range_start) & 
+                                      (df_indicators['DateTime_UTC'] < range_end)].copy()
+        print(f"Indicators within volatility date range: {len(df_indicators)} records.")
+        
         # 日本時間への変換
         df_indicators['DateTime_JST'] = df_indicators['DateTime_UTC'].dt.tz_localize('UTC').dt.tz_convert('Asia/Tokyo')
         
@@ -67,6 +80,10 @@ def main():
         df_indicators['Date_JST'] = df_indicators['DateTime_JST'].dt.strftime('%Y-%m-%d')
         df_indicators['Hour_JST'] = df_indicators['DateTime_JST'].dt.hour
         
+        # ボラティリティデータに存在する日付のみを残す
+        valid_dates = df_volatility['Date_JST'].unique()
+        df_indicators = df_indicators[df_indicators['Date_JST'].isin(valid_dates)]
+        
         print("Date and time conversion completed.")
     except Exception as e:
         print(f"Error during date/time conversion: {e}")
@@ -16,16 +16,38 @@ MT5側で出力されたCSVファイルを検出し、データ処理パイプ
 - エラー処理とリカバリーメカニズム
 """
 
+import io
 import os
+import sys
 import time
+import threading
 import logging
-import pandas as pd
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler, FileCreatedEvent, FileModifiedEvent
 
+# pandas/numpyは最初のファイル処理時に読み込む（監視だけの待機中は読み込まない）
+pd = None
+np = None
+
+# 文字列列の型（pandas読み込み時に決定する）
+TEXT_DTYPE = None
+
+# io_uringによる一括読み込みはLinuxかつliburingが利用可能な場合のみ有効
+try:
+    import liburing
+except ImportError:
+    liburing = None
+
+# MT5が出力する日時の書式（TimeToStringのTIME_DATE|TIME_SECONDS）
+MT5_DATETIME_FORMAT = "%Y.%m.%d %H:%M:%S"
+
+# 日本時間（UTC+9）とのずれ（ナノ秒）
+JST_OFFSET_NS = 9 * 3600 * 1_000_000_000
+
 # ロガーの設定
 logger = logging.getLogger(__name__)
 logging.basicConfig(
@@ -33,12 +55,32 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+def _import_data_libraries():
+    """
+    データ処理に必要なライブラリを読み込む（初回呼び出し時のみ）
+    """
+    global pd, np, TEXT_DTYPE
+    if pd is not None:
+        return
+    
+    import numpy as np
+    import pandas as pd
+    
+    # 文字列列はpyarrowが利用可能であればArrow形式で保持する（書き出し時のPython文字列生成を省く）
+    try:
+        import pyarrow as pa
+        TEXT_DTYPE = pd.ArrowDtype(pa.string())
+    except ImportError:
+        TEXT_DTYPE = "category"
+
+
 class EconomicIndicatorFileHandler(FileSystemEventHandler):
     """
     経済指標ファイルの変更を検出し処理するハンドラークラス
     """
     
-    def __init__(self, callback_function=None, target_dir=None, done_suffix=".done"):
+    def __init__(self, callback_function=None, target_dir=None, done_suffix=".done",
+                 debounce_seconds=0.5, max_tracked_files=10_000, done_cache_ttl=0.5):
         """
         初期化
         
@@ -46,12 +88,78 @@ class EconomicIndicatorFileHandler(FileSystemEventHandler):
             callback_function: 新しいファイルが検出された時に呼び出す関数
             target_dir: 監視対象ディレクトリ
             done_suffix: 完了フラグファイルの接尾辞
+            debounce_seconds: 同一ファイルの連続イベントをまとめる時間（秒）
+            max_tracked_files: 処理済み・イベント履歴として保持する最大ファイル数
+            done_cache_ttl: 完了フラグファイル一覧のキャッシュを再取得するまでの時間（秒）
         """
         self.callback_function = callback_function
         self.target_dir = Path(target_dir) if target_dir else None
         self.done_suffix = done_suffix
-        self.processed_files = set()  # 処理済みファイルを追跡
+        self.debounce_seconds = debounce_seconds
+        self.max_tracked_files = max_tracked_files
+        self.done_cache_ttl = done_cache_ttl
+        self.processed_files = OrderedDict()  # 処理済みファイルの(デバイス, inode, 更新時刻, サイズ)を追跡（LRU）
+        self._recent_events = OrderedDict()  # (デバイス, inode, 更新時刻, サイズ) -> 最終イベント時刻
+        self._done_cache = set()  # ディレクトリ内の完了フラグファイル名
+        self._done_cache_dir = None  # 完了フラグファイル一覧を取得したディレクトリ
+        self._done_cache_time = float('-inf')  # 完了フラグファイル一覧を取得した時刻
+        self._processing = set()  # コールバックを実行中のファイルの(デバイス, inode, 更新時刻, サイズ)
+        # 監視スレッドと既存ファイルのチェックの両方から呼ばれるため、上記の状態はロック内で更新する
+        self._lock = threading.Lock()
+        
+    def _remember(self, cache: OrderedDict, key, value=True):
+        """
+        LRUキャッシュにキーを登録し、上限を超えた古いエントリを破棄する
+        
+        Args:
+            cache: 対象のOrderedDict
+            key: 登録するキー
+            value: 登録する値
+        """
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.max_tracked_files:
+            cache.popitem(last=False)
+        
+    def _refresh_done_cache(self, directory: Path):
+        """
+        ディレクトリを走査して完了フラグファイル名の一覧を再取得する
+        
+        Args:
+            directory: 走査するディレクトリ
+        """
+        try:
+            with os.scandir(directory) as entries:
+                self._done_cache = {entry.name for entry in entries
+                                    if entry.name.endswith(self.done_suffix)}
+        except OSError as e:
+            logger.warning(f"完了フラグファイルの一覧を取得できませんでした: {e}")
+            self._done_cache = set()
+        self._done_cache_dir = directory
+        self._done_cache_time = time.monotonic()
+    
+    def _has_done_file(self, file_path: Path) -> bool:
+        """
+        CSVファイルに対応する完了フラグファイルが存在するか確認する
+        
+        Args:
+            file_path: CSVファイルのパス
+            
+        Returns:
+            bool: 完了フラグファイルが存在するかどうか
+        """
+        directory = self.target_dir or file_path.parent
+        done_name = file_path.stem + self.done_suffix
+        if done_name in self._done_cache and directory == self._done_cache_dir:
+            return True
         
+        # 見つからない場合は一覧が古ければ取り直す（短時間の再走査は行わない）
+        if (directory != self._done_cache_dir
+                or time.monotonic() - self._done_cache_time > self.done_cache_ttl):
+            self._refresh_done_cache(directory)
+            return done_name in self._done_cache
+        return False
+    
     def on_created(self, event):
         """
         ファイル作成イベントのハンドラー
@@ -81,30 +189,66 @@ class EconomicIndicatorFileHandler(FileSystemEventHandler):
         """
         file_path = Path(event.src_path)
         
-        # 既に処理済みのファイルはスキップ
-        if str(file_path) in self.processed_files:
+        # 完了フラグファイルの作成は一覧のキャッシュに反映する
+        if file_path.name.endswith(self.done_suffix):
+            with self._lock:
+                if (self.target_dir or file_path.parent) == self._done_cache_dir:
+                    self._done_cache.add(file_path.name)
             return
+        
+        # 経済指標CSVファイル以外は無視
+        if not (file_path.name.startswith("EconomicIndicators_") and 
+                file_path.suffix.lower() == ".csv"):
+            return
+        
+        # ファイルはパス文字列ではなく(デバイス, inode)で識別する
+        # （一時ファイルからのリネームでも同一ファイルとして扱える）
+        # inodeは削除後に再利用されるため、更新時刻とサイズも含めて別のファイルと区別する
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return
+        file_key = (stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        
+        # 確認と登録はロック内でまとめて行い、同じファイルを二重に処理しないようにする
+        # （コールバックはロックの外で実行し、他のファイルのイベントを待たせない）
+        with self._lock:
+            # 既に処理済み、または処理中のファイルはスキップ
+            if file_key in self.processed_files:
+                self.processed_files.move_to_end(file_key)
+                return
+            if file_key in self._processing:
+                return
             
-        # 経済指標CSVファイルかつ完了フラグファイルが存在する場合のみ処理
-        if (file_path.name.startswith("EconomicIndicators_") and 
-            file_path.suffix.lower() == ".csv"):
+            # 同一内容（更新時刻とサイズが同じ）のファイルに対する短時間の連続イベントはまとめる
+            now = time.monotonic()
+            last_seen = self._recent_events.get(file_key)
+            if last_seen is not None and now - last_seen < self.debounce_seconds:
+                return
+            self._remember(self._recent_events, file_key, now)
             
-            # 対応する完了フラグファイルのパス
-            done_file = file_path.with_suffix(self.done_suffix)
+            # 完了フラグファイルが存在するか確認（キャッシュしたディレクトリ一覧で判定）
+            if not self._has_done_file(file_path):
+                return
             
-            # 完了フラグファイルが存在するか確認
-            if done_file.exists():
-                logger.info(f"新しい経済指標ファイルを検出しました: {file_path}")
-                
-                # コールバック関数が設定されていれば呼び出す
-                if self.callback_function:
-                    try:
-                        self.callback_function(file_path)
-                        # 処理済みとしてマーク
-                        self.processed_files.add(str(file_path))
-                        logger.info(f"ファイルの処理が完了しました: {file_path}")
-                    except Exception as e:
-                        logger.error(f"ファイル処理中にエラーが発生しました: {e}")
+            self._processing.add(file_key)
+        
+        logger.info(f"新しい経済指標ファイルを検出しました: {file_path}")
+        
+        # コールバック関数が設定されていれば呼び出す
+        try:
+            if self.callback_function:
+                try:
+                    self.callback_function(file_path)
+                    # 処理済みとしてマーク
+                    with self._lock:
+                        self._remember(self.processed_files, file_key)
+                    logger.info(f"ファイルの処理が完了しました: {file_path}")
+                except Exception as e:
+                    logger.error(f"ファイル処理中にエラーが発生しました: {e}")
+        finally:
+            with self._lock:
+                self._processing.discard(file_key)
 
 
 class MT5Integration:
@@ -117,7 +261,10 @@ class MT5Integration:
                  output_dir: str = "../csv/MergedData",
                  done_suffix: str = ".done",
                  retry_interval: int = 60,
-                 max_retries: int = 5):
+                 max_retries: int = 5,
+                 chunk_size: int = 100_000,
+                 use_uring: bool = False,
+                 uring_queue_depth: int = 64):
         """
         初期化
         
@@ -127,12 +274,21 @@ class MT5Integration:
             done_suffix: 完了フラグファイルの接尾辞
             retry_interval: エラー時のリトライ間隔（秒）
             max_retries: 最大リトライ回数
+            chunk_size: CSVを分割して処理する際の1チャンクあたりの行数
+            use_uring: 既存ファイルをio_uringでまとめて読み込むかどうか（Linuxのみ）
+            uring_queue_depth: io_uringのキューの深さ（一度に発行する読み込み数）
         """
         self.csv_dir = Path(csv_dir)
         self.output_dir = Path(output_dir)
         self.done_suffix = done_suffix
         self.retry_interval = retry_interval
         self.max_retries = max_retries
+        self.chunk_size = chunk_size
+        self.uring_queue_depth = uring_queue_depth
+        self.use_uring = use_uring and liburing is not None and sys.platform.startswith("linux")
+        if use_uring and not self.use_uring:
+            logger.warning("io_uringが利用できないため、通常のファイル読み込みを使用します")
+        self._prefetched_buffers = {}  # io_uringで先読みしたファイル内容
         self.observer = None
         
         # ディレクトリの存在確認と作成
@@ -167,7 +323,7 @@ class MT5Integration:
         
         try:
             # 既存ファイルのチェック（起動時に既に存在するファイルを処理）
-            self._check_existing_files()
+            self._check_existing_files(event_handler)
             
             logger.info("ファイル監視中... Ctrl+Cで終了")
             while True:
@@ -184,27 +340,99 @@ class MT5Integration:
             self.observer.join()
             logger.info("ファイル監視を停止しました")
     
-    def _check_existing_files(self):
+    def _check_existing_files(self, event_handler: Optional[EconomicIndicatorFileHandler] = None):
         """
         既存のファイルをチェックして処理
+        
+        Args:
+            event_handler: 監視で使用しているイベントハンドラー（処理済みファイルの情報を共有する）
         """
         logger.info(f"既存ファイルをチェックしています: {self.csv_dir}")
         
         # CSVファイルとそれに対応する完了フラグファイルを探す
-        csv_files = list(self.csv_dir.glob("EconomicIndicators_*.csv"))
-        
-        for csv_file in csv_files:
-            done_file = csv_file.with_suffix(self.done_suffix)
-            if done_file.exists():
-                # 完了フラグファイルが存在する場合、手動でイベントを発生させる
-                logger.info(f"既存の完了済みファイルを検出: {csv_file}")
-                event = FileCreatedEvent(str(csv_file))
-                handler = EconomicIndicatorFileHandler(
-                    callback_function=self.process_indicator_file,
-                    target_dir=self.csv_dir,
-                    done_suffix=self.done_suffix
-                )
-                handler.on_created(event)
+        # （ディレクトリは一度だけ走査し、完了フラグの有無はファイル名の集合で判定する）
+        csv_files = []
+        entry_names = set()
+        with os.scandir(self.csv_dir) as entries:
+            for entry in entries:
+                entry_names.add(entry.name)
+                if (entry.name.startswith("EconomicIndicators_")
+                        and entry.name.endswith(".csv")
+                        and entry.is_file()):
+                    csv_files.append(Path(entry.path))
+        
+        ready_files = [csv_file for csv_file in csv_files
+                       if csv_file.stem + self.done_suffix in entry_names]
+        
+        # 完了済みファイルの内容をio_uringでまとめて先読みする
+        if self.use_uring and ready_files:
+            try:
+                self._prefetched_buffers.update(self._read_files_uring(ready_files))
+            except Exception as e:
+                logger.warning(f"io_uringによる読み込みに失敗したため、通常の読み込みを使用します: {e}")
+        
+        # ハンドラーは全ファイルで共有し、監視側のイベントとも重複処理を防ぐ
+        if event_handler is None:
+            event_handler = EconomicIndicatorFileHandler(
+                callback_function=self.process_indicator_file,
+                target_dir=self.csv_dir,
+                done_suffix=self.done_suffix
+            )
+        
+        for csv_file in ready_files:
+            # 完了フラグファイルが存在する場合、手動でイベントを発生させる
+            logger.info(f"既存の完了済みファイルを検出: {csv_file}")
+            event_handler.on_created(FileCreatedEvent(str(csv_file)))
+        
+        # 処理されなかったファイルの先読みバッファは破棄
+        self._prefetched_buffers.clear()
+    
+    def _read_files_uring(self, file_paths: List[Path]) -> Dict[Path, bytes]:
+        """
+        io_uringを使用して複数ファイルの読み込みをまとめて発行する
+        
+        Args:
+            file_paths: 読み込むファイルパスのリスト
+            
+        Returns:
+            Dict[Path, bytes]: ファイルパスとその内容の辞書（全体を読めたファイルのみ）
+        """
+        buffers = {}
+        ring = liburing.Ring()
+        cqe = liburing.Cqe()
+        liburing.io_uring_queue_init(self.uring_queue_depth, ring)
+        try:
+            for start in range(0, len(file_paths), self.uring_queue_depth):
+                batch = file_paths[start:start + self.uring_queue_depth]
+                pending = []
+                try:
+                    # キューの深さ分の読み込み要求をまとめて登録
+                    for index, file_path in enumerate(batch):
+                        fd = os.open(file_path, os.O_RDONLY)
+                        buf = bytearray(os.fstat(fd).st_size)
+                        pending.append((fd, buf))
+                        sqe = liburing.io_uring_get_sqe(ring)
+                        liburing.io_uring_prep_read(sqe, fd, buf)
+                        liburing.io_uring_sqe_set_data64(sqe, index)
+                    liburing.io_uring_submit(ring)
+                    
+                    # 完了イベントを回収（一度に読み切れなかったファイルは通常の読み込みに任せる）
+                    for _ in pending:
+                        liburing.io_uring_wait_cqe(ring, cqe)
+                        index = liburing.io_uring_cqe_get_data64(cqe[0])
+                        result = cqe[0].res
+                        liburing.io_uring_cqe_seen(ring, cqe[0])
+                        buf = pending[index][1]
+                        if result == len(buf):
+                            buffers[batch[index]] = bytes(buf)
+                finally:
+                    for fd, _ in pending:
+                        os.close(fd)
+        finally:
+            liburing.io_uring_queue_exit(ring)
+        
+        logger.info(f"io_uringで{len(buffers)}/{len(file_paths)}ファイルを読み込みました")
+        return buffers
     
     def process_indicator_file(self, file_path: Path) -> bool:
         """
@@ -216,47 +444,91 @@ class MT5Integration:
         Returns:
             bool: 処理が成功したかどうか
         """
+        _import_data_libraries()
+        
+        # io_uringで先読み済みであればその内容を使用する
+        prefetched = self._prefetched_buffers.pop(file_path, None)
+        
         retries = 0
         while retries <= self.max_retries:
+            temp_path = None
             try:
                 logger.info(f"経済指標ファイルの処理を開始: {file_path}")
+                source = io.BytesIO(prefetched) if prefetched is not None else file_path
                 
-                # CSVファイルの読み込み
-                df = pd.read_csv(file_path)
-                
-                # 基本的なデータ検証
-                if df.empty:
-                    logger.warning(f"ファイルにデータがありません: {file_path}")
-                    return False
-                
-                # 必要なカラムがあるか確認
+                # 必要なカラムがあるか確認（ヘッダー行のみ読み込む）
                 required_columns = ["DateTime (UTC)", "Currency", "EventName", "Forecast", "Actual"]
-                missing_columns = [col for col in required_columns if col not in df.columns]
+                header_columns = pd.read_csv(source, nrows=0).columns
+                if prefetched is not None:
+                    source.seek(0)
+                missing_columns = [col for col in required_columns if col not in header_columns]
                 if missing_columns:
                     logger.error(f"必要なカラムがありません: {missing_columns}")
                     return False
                 
-                # 日時の変換
-                df['DateTime_UTC'] = pd.to_datetime(df['DateTime (UTC)'])
-                
-                # 日本時間への変換
-                df['DateTime_JST'] = df['DateTime_UTC'] + pd.Timedelta(hours=9)
-                
-                # 日付と時刻を分離
-                df['Date_JST'] = df['DateTime_JST'].dt.date
-                df['Time_JST'] = df['DateTime_JST'].dt.time
-                
                 # 出力ファイル名の生成
                 output_filename = f"Processed_{file_path.stem}.csv"
                 output_path = self.output_dir / output_filename
+                # 書き込み途中のファイルを完成品として読まれないよう、一時ファイルに書いてから置き換える
+                temp_path = output_path.with_name(output_path.name + '.tmp')
                 
-                # 処理済みデータの保存
-                df.to_csv(output_path, index=False)
-                logger.info(f"処理済みデータを保存しました: {output_path}")
+                # CSVファイルをチャンク単位で読み込み、処理して追記する
+                # （必要な列のみ、型指定を読み込みと同時に行う）
+                total_rows = 0
+                with pd.read_csv(
+                    source,
+                    usecols=required_columns,
+                    dtype={"Currency": TEXT_DTYPE, "EventName": TEXT_DTYPE,
+                           "Forecast": "float64", "Actual": "float64"},
+                    engine="c",
+                    chunksize=self.chunk_size
+                ) as reader:
+                    for chunk in reader:
+                        if chunk.empty:
+                            continue
+                        
+                        # 日時の変換（書式を指定して推論を省き、同一値の解析結果を再利用する）
+                        utc_ns = pd.to_datetime(chunk['DateTime (UTC)'], format=MT5_DATETIME_FORMAT,
+                                                cache=True).to_numpy(dtype='datetime64[ns]')
+                        chunk['DateTime_UTC'] = utc_ns
+                        
+                        # 日本時間への変換（エポックナノ秒の整数演算、欠損値はNaTのまま）
+                        is_nat = np.isnat(utc_ns)
+                        jst_ns = utc_ns.view('i8') + JST_OFFSET_NS
+                        jst_ns[is_nat] = np.iinfo(np.int64).min
+                        chunk['DateTime_JST'] = jst_ns.view('datetime64[ns]')
+                        
+                        # 日付と時刻を分離（Pythonのdate/timeオブジェクトを作らず文字列として切り出す）
+                        stamps = pd.Series(np.datetime_as_string(jst_ns.view('datetime64[ns]'), unit='s'),
+                                           index=chunk.index).mask(is_nat)
+                        chunk['Date_JST'] = stamps.str.slice(0, 10)
+                        chunk['Time_JST'] = stamps.str.slice(11)
+                        
+                        # 処理済みデータの保存（最初のチャンクのみヘッダー付きで新規作成）
+                        # チャンク間で日時の書式が変わらないよう書式を固定する
+                        is_first_chunk = total_rows == 0
+                        chunk.to_csv(temp_path, index=False, date_format='%Y-%m-%d %H:%M:%S',
+                                     header=is_first_chunk, mode='w' if is_first_chunk else 'a')
+                        total_rows += len(chunk)
+                
+                # 基本的なデータ検証
+                if total_rows == 0:
+                    logger.warning(f"ファイルにデータがありません: {file_path}")
+                    return False
+                
+                # 全チャンクの書き込みが終わってから出力ファイル名に置き換える
+                os.replace(temp_path, output_path)
+                logger.info(f"処理済みデータを保存しました: {output_path} ({total_rows} records)")
                 
                 return True
                 
             except Exception as e:
+                # 途中まで書き込んだ一時ファイルは残さない
+                if temp_path is not None:
+                    try:
+                        temp_path.unlink(missing_ok=True)
+                    except OSError:
+                        pass
                 retries += 1
                 logger.error(f"処理中にエラーが発生しました ({retries}/{self.max_retries}): {e}")
                 if retries <= self.max_retries:
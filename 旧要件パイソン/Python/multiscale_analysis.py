@@ -18,11 +18,124 @@ import pandas as pd
 import numpy as np
 import logging
 from typing import Dict, List, Optional, Tuple, Union, Any
-from scipy import stats
+
+from jit_utils import njit, prange
 
 # ロガーの設定
 logger = logging.getLogger(__name__)
 
+
+@njit(cache=True)
+def _linear_fit(x: np.ndarray, y: np.ndarray) -> Tuple[float, float, float, float]:
+    """
+    最小二乗法による単回帰を閉形式で計算する（scipy.stats.linregress相当）
+    
+    Args:
+        x: 説明変数（float64配列）
+        y: 目的変数（float64配列）
+        
+    Returns:
+        Tuple[float, float, float, float]: (傾き, 切片, 相関係数, 傾きの標準誤差)
+    """
+    n = x.size
+    sx = 0.0
+    sy = 0.0
+    for i in range(n):
+        sx += x[i]
+        sy += y[i]
+    mx = sx / n
+    my = sy / n
+    
+    ssxm = 0.0
+    ssym = 0.0
+    ssxym = 0.0
+    for i in range(n):
+        dx = x[i] - mx
+        dy = y[i] - my
+        ssxm += dx * dx
+        ssym += dy * dy
+        ssxym += dx * dy
+    
+    if ssxm == 0.0:
+        return np.nan, np.nan, 0.0, np.nan
+    
+    slope = ssxym / ssxm
+    intercept = my - slope * mx
+    
+    if ssym == 0.0:
+        r = 0.0
+    else:
+        r = ssxym / np.sqrt(ssxm * ssym)
+        r = min(max(r, -1.0), 1.0)
+    
+    if n > 2:
+        std_err = np.sqrt((1.0 - r * r) * ssym / ssxm / (n - 2))
+    else:
+        std_err = 0.0
+    
+    return slope, intercept, r, std_err
+
+
+@njit(parallel=True, cache=True)
+def _scale_ratios(ref: np.ndarray, mat: np.ndarray, ratios: np.ndarray, log_ratios: np.ndarray) -> None:
+    """
+    基準スケールに対する各スケールの比率とその対数を列ごとに並列で計算する
+    
+    Args:
+        ref: 基準スケールの価格変動（長さnのfloat64配列）
+        mat: 各スケールの価格変動（n×kのfloat64配列）
+        ratios: 比率の出力先（n×k、基準が0または欠損の行はNaN）
+        log_ratios: 対数比率の出力先（n×k、比率が正でない行はNaN）
+    """
+    n, k = mat.shape
+    for j in prange(k):
+        for i in range(n):
+            r = np.nan
+            if np.isfinite(ref[i]) and np.isfinite(mat[i, j]) and ref[i] != 0.0:
+                r = mat[i, j] / ref[i]
+            ratios[i, j] = r
+            log_ratios[i, j] = np.log(r) if r > 0.0 else np.nan
+
+
+def _regression_p_values(r_values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    相関係数とサンプル数から傾きの両側p値をまとめて計算する
+    
+    Args:
+        r_values: 相関係数の配列
+        counts: 各回帰のサンプル数の配列
+        
+    Returns:
+        ndarray: p値の配列
+    """
+    # scipyの読み込みは重いため、p値が必要になった時点で読み込む
+    from scipy import stats
+    
+    r_values = np.asarray(r_values, dtype=np.float64)
+    dof = np.asarray(counts, dtype=np.float64) - 2
+    
+    p_values = np.zeros_like(r_values)
+    valid = dof > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_values = r_values[valid] * np.sqrt(dof[valid] / ((1.0 - r_values[valid]) * (1.0 + r_values[valid])))
+    p_values[valid] = 2 * stats.t.sf(np.abs(t_values), dof[valid])
+    return p_values
+
+
+def _round_floats(df: pd.DataFrame, decimals: int = 4) -> pd.DataFrame:
+    """
+    float64列の小数点以下の桁数をまとめて制限する
+    
+    Args:
+        df: 対象のデータフレーム
+        decimals: 残す小数点以下の桁数
+        
+    Returns:
+        DataFrame: 丸め後のデータフレーム
+    """
+    return df.round({col: decimals for col in df.select_dtypes(include='float64').columns})
+
+
 class MultiscaleAnalyzer:
     """
     異なる時間スケールでの分析を行うクラス
@@ -46,6 +159,12 @@ class MultiscaleAnalyzer:
             self.time_scales.append(self.reference_scale)
             self.time_scales.sort()
         
+        # 各メソッドで使う列名とスケール配列を事前計算
+        self._movement_cols = [f"post_{scale}min_price_movement" for scale in self.time_scales]
+        self._ref_col = f"post_{self.reference_scale}min_price_movement"
+        self._scales_arr = np.asarray(self.time_scales, dtype=np.float64)
+        self._log_scales = np.log(self._scales_arr)
+        
         logger.info(f"MultiscaleAnalyzer initialized with time_scales={self.time_scales}, "
                    f"reference_scale={self.reference_scale}")
     
@@ -61,43 +180,44 @@ class MultiscaleAnalyzer:
             DataFrame: スケール比率が追加されたデータフレーム
         """
         try:
-            # コピーを作成して変更
-            result_df = analyzed_df.copy()
-            
             # 基準スケール列の名前を取得
-            ref_movement_col = f"post_{self.reference_scale}min_price_movement"
+            ref_movement_col = self._ref_col
             
             # 基準スケール列が存在するか確認
-            if ref_movement_col not in result_df.columns:
+            if ref_movement_col not in analyzed_df.columns:
                 logger.error(f"Reference scale column '{ref_movement_col}' not found in dataframe")
                 return analyzed_df
             
-            # 各スケールと基準スケールの比率を計算
-            for scale in self.time_scales:
+            # 比率を計算する対象スケール列を抽出
+            target_scales = []
+            target_cols = []
+            for scale, scale_col in zip(self.time_scales, self._movement_cols):
                 if scale == self.reference_scale:
                     continue
                 
-                scale_col = f"post_{scale}min_price_movement"
-                
                 # 対象スケール列が存在するか確認
-                if scale_col not in result_df.columns:
+                if scale_col not in analyzed_df.columns:
                     logger.warning(f"Scale column '{scale_col}' not found, skipping")
                     continue
                 
-                # 比率を計算（ゼロ除算を防止）
-                ratio_col = f"scale_ratio_{scale}_to_{self.reference_scale}"
-                result_df[ratio_col] = result_df.apply(
-                    lambda row: row[scale_col] / row[ref_movement_col] 
-                    if pd.notna(row[scale_col]) and pd.notna(row[ref_movement_col]) and row[ref_movement_col] != 0 
-                    else np.nan, 
-                    axis=1
-                )
+                target_scales.append(scale)
+                target_cols.append(scale_col)
+            
+            # 追加する列は辞書にまとめ、入力データフレーム全体のコピーを避ける
+            new_cols = {}
+            if target_cols:
+                # 全スケールの比率と標準化比率（対数変換で正規化）を1つのカーネルで計算（ゼロ除算を防止）
+                ref = analyzed_df[ref_movement_col].to_numpy(dtype=np.float64)
+                mat = np.ascontiguousarray(analyzed_df[target_cols].to_numpy(dtype=np.float64))
+                ratios = np.empty_like(mat)
+                log_ratios = np.empty_like(mat)
+                _scale_ratios(ref, mat, ratios, log_ratios)
                 
-                # 標準化比率（対数変換で正規化）
-                norm_ratio_col = f"norm_scale_ratio_{scale}_to_{self.reference_scale}"
-                result_df[norm_ratio_col] = result_df[ratio_col].apply(
-                    lambda x: np.log(x) if pd.notna(x) and x > 0 else np.nan
-                )
+                for j, scale in enumerate(target_scales):
+                    new_cols[f"scale_ratio_{scale}_to_{self.reference_scale}"] = ratios[:, j]
+                    new_cols[f"norm_scale_ratio_{scale}_to_{self.reference_scale}"] = log_ratios[:, j]
+            
+            result_df = analyzed_df.assign(**new_cols)
             
             logger.info(f"Scale ratios calculated for {len(result_df)} records")
             return result_df
@@ -118,11 +238,8 @@ class MultiscaleAnalyzer:
             DataFrame: 時間スケール間の相関係数
         """
         try:
-            # 各スケールの価格変動列を取得
-            movement_cols = [f"post_{scale}min_price_movement" for scale in self.time_scales]
-            
             # 存在しない列をフィルタリング
-            valid_cols = [col for col in movement_cols if col in analyzed_df.columns]
+            valid_cols = [col for col in self._movement_cols if col in analyzed_df.columns]
             
             if len(valid_cols) < 2:
                 logger.error("Insufficient valid scale columns for correlation analysis")
@@ -150,52 +267,81 @@ class MultiscaleAnalyzer:
             DataFrame: 波及効果分析の結果
         """
         try:
-            # 隣接するスケール間の関係を分析
-            results = []
-            
+            # 両方の列が存在する隣接スケールのペアを抽出
+            pairs = []
             for i in range(len(self.time_scales) - 1):
-                smaller_scale = self.time_scales[i]
-                larger_scale = self.time_scales[i + 1]
-                
-                smaller_col = f"post_{smaller_scale}min_price_movement"
-                larger_col = f"post_{larger_scale}min_price_movement"
-                
-                # 両方の列が存在するか確認
+                smaller_col = self._movement_cols[i]
+                larger_col = self._movement_cols[i + 1]
                 if smaller_col not in analyzed_df.columns or larger_col not in analyzed_df.columns:
                     logger.warning(f"Columns {smaller_col} or {larger_col} not found, skipping")
                     continue
+                pairs.append(i)
+            
+            # 分析結果を格納するためのリスト
+            results = []
+            
+            if pairs:
+                # 全スケールの価格変動を1つの行列として取り出し、ペアごとの列を並べる
+                present_cols = list(dict.fromkeys(
+                    col for i in pairs for col in (self._movement_cols[i], self._movement_cols[i + 1])
+                ))
+                mat = analyzed_df[present_cols].to_numpy(dtype=np.float64)
+                col_index = {col: j for j, col in enumerate(present_cols)}
+                x = mat[:, [col_index[self._movement_cols[i]] for i in pairs]]
+                y = mat[:, [col_index[self._movement_cols[i + 1]] for i in pairs]]
                 
-                # 有効なデータのみを抽出
-                valid_data = analyzed_df.dropna(subset=[smaller_col, larger_col])
-                
-                if len(valid_data) < 5:
-                    logger.warning(f"Insufficient valid data for scales {smaller_scale} and {larger_scale}")
-                    continue
-                
-                # 両スケールの相関係数
-                correlation, p_value = stats.pearsonr(valid_data[smaller_col], valid_data[larger_col])
-                
-                # 成長率: 大きいスケール / 小さいスケール
-                avg_growth_ratio = np.mean(valid_data[larger_col] / valid_data[smaller_col].replace(0, np.nan))
-                
-                # 回帰分析: 小さいスケールから大きいスケールを予測
-                slope, intercept, r_value, p_value, std_err = stats.linregress(
-                    valid_data[smaller_col], valid_data[larger_col]
-                )
+                # 両スケールとも有効な行のみを対象に、全ペア分の統計量を一括で計算
+                mask = ~(np.isnan(x) | np.isnan(y))
+                counts = mask.sum(axis=0)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    x_mean = np.where(mask, x, 0.0).sum(axis=0) / counts
+                    y_mean = np.where(mask, y, 0.0).sum(axis=0) / counts
+                    dx = np.where(mask, x - x_mean, 0.0)
+                    dy = np.where(mask, y - y_mean, 0.0)
+                    ssxm = (dx * dx).sum(axis=0)
+                    ssym = (dy * dy).sum(axis=0)
+                    ssxym = (dx * dy).sum(axis=0)
+                    
+                    # 相関係数（どちらかが定数の場合は定義できない）
+                    correlations = np.clip(ssxym / np.sqrt(ssxm * ssym), -1.0, 1.0)
+                    correlations[(ssxm == 0) | (ssym == 0)] = np.nan
+                    
+                    # 回帰分析: 小さいスケールから大きいスケールを予測
+                    slopes = np.where(ssxm == 0, np.nan, ssxym / ssxm)
+                    intercepts = y_mean - slopes * x_mean
+                    r_values = np.where((ssxm == 0) | (ssym == 0), 0.0, np.nan_to_num(correlations))
+                    std_errs = np.where(
+                        ssxm == 0, np.nan,
+                        np.sqrt(np.where(counts > 2, (1.0 - r_values ** 2) * ssym / ssxm / (counts - 2), 0.0))
+                    )
                 
-                # 結果を保存
-                results.append({
-                    'smaller_scale': smaller_scale,
-                    'larger_scale': larger_scale,
-                    'count': len(valid_data),
-                    'correlation': correlation,
-                    'avg_growth_ratio': avg_growth_ratio,
-                    'regression_slope': slope,
-                    'regression_intercept': intercept,
-                    'regression_r_squared': r_value ** 2,
-                    'regression_p_value': p_value,
-                    'regression_std_err': std_err
-                })
+                for k, i in enumerate(pairs):
+                    smaller_scale = self.time_scales[i]
+                    larger_scale = self.time_scales[i + 1]
+                    
+                    if counts[k] < 5:
+                        logger.warning(f"Insufficient valid data for scales {smaller_scale} and {larger_scale}")
+                        continue
+                    
+                    # 成長率: 大きいスケール / 小さいスケール（ゼロ除算と欠損はNaNのまま残す）
+                    growth_ratios = np.full(len(x), np.nan)
+                    np.divide(y[:, k], x[:, k], out=growth_ratios, where=mask[:, k] & (x[:, k] != 0))
+                    avg_growth_ratio = (np.nanmean(growth_ratios)
+                                        if not np.isnan(growth_ratios).all() else np.nan)
+                    
+                    # 結果を保存
+                    results.append({
+                        'smaller_scale': smaller_scale,
+                        'larger_scale': larger_scale,
+                        'count': int(counts[k]),
+                        'correlation': correlations[k],
+                        'avg_growth_ratio': avg_growth_ratio,
+                        'regression_slope': slopes[k],
+                        'regression_intercept': intercepts[k],
+                        'regression_r_squared': r_values[k] ** 2,
+                        'regression_r_value': r_values[k],
+                        'regression_std_err': std_errs[k]
+                    })
             
             if not results:
                 logger.warning("No valid propagation effects could be calculated")
@@ -204,10 +350,16 @@ class MultiscaleAnalyzer:
             # 結果をDataFrameに変換
             results_df = pd.DataFrame(results)
             
+            # p値は全ペア分をまとめて計算（相関係数の列を除いてから挿入位置を求め、標準誤差の前に置く）
+            r_values = results_df.pop('regression_r_value').to_numpy()
+            results_df.insert(
+                results_df.columns.get_loc('regression_std_err'),
+                'regression_p_value',
+                _regression_p_values(r_values, results_df['count'].to_numpy())
+            )
+            
             # 小数点以下の桁数を制限
-            float_cols = [col for col in results_df.columns if results_df[col].dtype == 'float64']
-            for col in float_cols:
-                results_df[col] = results_df[col].round(4)
+            results_df = _round_floats(results_df)
             
             logger.info(f"Propagation effects analyzed for {len(results_df)} scale pairs")
             return results_df
@@ -239,53 +391,53 @@ class MultiscaleAnalyzer:
                     logger.error("Unable to identify event columns for grouping")
                     return pd.DataFrame()
             
-            # 分析結果を格納するためのリスト
-            results = []
+            # 存在するスケール列とその対数スケール
+            scale_present = np.array([col in analyzed_df.columns for col in self._movement_cols])
+            present_scales = np.asarray(self.time_scales)[scale_present]
+            movement_cols = [col for col, present in zip(self._movement_cols, scale_present) if present]
+            present_log_scales = self._log_scales[scale_present]
             
-            # 指標ごとにグループ化
+            # 指標ごとの平均価格変動と件数を一括で計算
             grouped = analyzed_df.groupby(id_columns)
+            means = grouped[movement_cols].mean()
+            counts = grouped.size()
             
-            for name, group in grouped:
-                if len(group) < 5:
-                    # サンプル数が少なすぎる場合はスキップ
-                    continue
-                
-                # 各スケールでの平均価格変動を計算
-                scale_movements = {}
-                for scale in self.time_scales:
-                    col = f"post_{scale}min_price_movement"
-                    if col in group.columns:
-                        movement = group[col].mean()
-                        if pd.notna(movement):
-                            scale_movements[scale] = movement
-                
-                if len(scale_movements) < 3:
+            # サンプル数が少なすぎる指標は除外
+            enough_samples = counts >= 5
+            means = means[enough_samples]
+            counts = counts[enough_samples]
+            
+            # 分析結果を格納するためのリスト
+            results = []
+            
+            for name, movements, count in zip(means.index, means.to_numpy(dtype=np.float64), counts.to_numpy()):
+                # 平均値が計算できたスケールのみを使用
+                valid = ~np.isnan(movements)
+                if valid.sum() < 3:
                     # 有効なスケールが少なすぎる場合はスキップ
                     continue
                 
-                # 対数変換したデータで回帰分析を実行
-                scales = np.array(list(scale_movements.keys()))
-                movements = np.array(list(scale_movements.values()))
-                
                 # 両対数プロットでの直線の傾きを計算（log(movement) = alpha * log(scale) + c）
-                log_scales = np.log(scales)
-                log_movements = np.log(movements)
+                valid_movements = movements[valid]
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    log_movements = np.log(valid_movements)
                 
-                slope, intercept, r_value, p_value, std_err = stats.linregress(log_scales, log_movements)
+                slope, intercept, r_value, std_err = _linear_fit(present_log_scales[valid], log_movements)
                 
                 # 結果を保存
                 result = {
                     id_columns[0]: name[0] if isinstance(name, tuple) else name,
                     id_columns[1]: name[1] if isinstance(name, tuple) and len(name) > 1 else '',
-                    'count': len(group),
+                    'count': count,
                     'scaling_exponent': slope,
                     'scaling_intercept': intercept,
                     'scaling_r_squared': r_value ** 2,
-                    'scaling_p_value': p_value,
+                    'scaling_r_value': r_value,
+                    'scale_count': len(valid_movements),
                 }
                 
                 # 各スケールでの平均値も追加
-                for scale, movement in scale_movements.items():
+                for scale, movement in zip(present_scales[valid], valid_movements):
                     result[f'avg_movement_{scale}min'] = movement
                 
                 results.append(result)
@@ -297,10 +449,15 @@ class MultiscaleAnalyzer:
             # 結果をDataFrameに変換
             results_df = pd.DataFrame(results)
             
+            # p値は全指標分をまとめて計算
+            results_df.insert(
+                results_df.columns.get_loc('scaling_r_value'),
+                'scaling_p_value',
+                _regression_p_values(results_df.pop('scaling_r_value').to_numpy(), results_df.pop('scale_count').to_numpy())
+            )
+            
             # 小数点以下の桁数を制限
-            float_cols = [col for col in results_df.columns if results_df[col].dtype == 'float64']
-            for col in float_cols:
-                results_df[col] = results_df[col].round(4)
+            results_df = _round_floats(results_df)
             
             logger.info(f"Scaling properties analyzed for {len(results_df)} indicators")
             return results_df
@@ -355,9 +512,6 @@ def compare_time_windows(df: pd.DataFrame,
         DataFrame: 比較結果
     """
     try:
-        # 比較結果を格納するためのリスト
-        results = []
-        
         # 各時間ウィンドウの列名を生成
         columns = [f"post_{window}min_{metric}" for window in windows]
         
@@ -367,43 +521,31 @@ def compare_time_windows(df: pd.DataFrame,
             logger.error(f"Missing columns in dataframe: {missing_cols}")
             return pd.DataFrame()
         
-        # 基本統計量の計算
-        for window, col in zip(windows, columns):
-            # 欠損値を除外
-            valid_data = df[col].dropna()
-            
-            if len(valid_data) < 2:
-                logger.warning(f"Insufficient data for window {window}")
-                continue
-            
-            # 統計量を計算
-            result = {
-                'window_minutes': window,
-                'mean': valid_data.mean(),
-                'median': valid_data.median(),
-                'std': valid_data.std(),
-                'min': valid_data.min(),
-                'max': valid_data.max(),
-                'count': len(valid_data)
-            }
-            
-            # 四分位数を計算
-            for q in [0.25, 0.75, 0.9]:
-                result[f'q{int(q*100)}'] = valid_data.quantile(q)
-            
-            results.append(result)
-        
-        if not results:
+        # 基本統計量と分位点をそれぞれ一括で計算（行: 列名）
+        unique_columns = list(dict.fromkeys(columns))
+        values = df[unique_columns]
+        stats_df = values.agg(['mean', 'median', 'std', 'min', 'max', 'count']).T
+        quantile_df = values.quantile([0.25, 0.75, 0.9]).T
+        quantile_df.columns = ['q25', 'q75', 'q90']
+        summary = pd.concat([stats_df, quantile_df], axis=1).reindex(columns)
+        
+        # 有効なデータが2件未満のウィンドウは除外
+        summary['count'] = summary['count'].astype(int)
+        insufficient = (summary['count'] < 2).to_numpy()
+        for window in np.asarray(windows)[insufficient]:
+            logger.warning(f"Insufficient data for window {window}")
+        
+        results_df = summary[~insufficient]
+        if results_df.empty:
             logger.warning("No valid comparison results could be calculated")
             return pd.DataFrame()
         
-        # 結果をDataFrameに変換
-        results_df = pd.DataFrame(results)
+        # 結果をDataFrameに変換（列名を時間ウィンドウに置き換え）
+        results_df.insert(0, 'window_minutes', np.asarray(windows)[~insufficient])
+        results_df = results_df.reset_index(drop=True)
         
         # 小数点以下の桁数を制限
-        float_cols = [col for col in results_df.columns if results_df[col].dtype == 'float64']
-        for col in float_cols:
-            results_df[col] = results_df[col].round(4)
+        results_df = _round_floats(results_df)
         
         logger.info(f"Time window comparison completed for {metric} across {len(windows)} windows")
         return results_df
@@ -489,61 +631,53 @@ def analyze_growth_patterns(df: pd.DataFrame,
             result['slope'] = slopes
             return result
             
-        # 指標ごとにグループ化して分析
-        results = []
+        # 指標ごとにグループ化し、各ウィンドウでの平均値と件数を一括で計算
+        grouped = df.groupby(group_by)
+        counts = grouped.size()
+        means = grouped[columns].mean()
         
-        for name, group in df.groupby(group_by):
-            if len(group) < 3:
-                # サンプル数が少なすぎる場合はスキップ
-                continue
-            
-            # 各ウィンドウでの平均値を計算
-            mean_values = [group[col].mean() for col in columns]
-            
-            # 成長率を計算
-            growth_rates = [1.0]
-            for i in range(1, len(mean_values)):
-                if mean_values[i-1] == 0:
-                    growth_rates.append(np.nan)
-                else:
-                    growth_rates.append(mean_values[i] / mean_values[i-1])
-            
-            # 結果データを作成
-            result = {
-                group_by[0]: name[0] if isinstance(name, tuple) else name,
-                'count': len(group)
-            }
-            
-            # 2つ目のグループ化列がある場合
-            if len(group_by) > 1 and isinstance(name, tuple) and len(name) > 1:
-                result[group_by[1]] = name[1]
-            
-            # 各ウィンドウでの値と成長率を追加
-            for i, window in enumerate(windows):
-                result[f'{metric}_{window}min'] = mean_values[i]
-                if i > 0:
-                    result[f'growth_{windows[i-1]}to{window}min'] = growth_rates[i]
-            
-            # 累積成長率（最初のウィンドウを基準とした相対値）
-            for i, window in enumerate(windows):
-                if i == 0:
-                    result[f'cumulative_growth_{window}min'] = 1.0
-                else:
-                    result[f'cumulative_growth_{window}min'] = mean_values[i] / mean_values[0] if mean_values[0] > 0 else np.nan
-            
-            results.append(result)
+        # サンプル数が少なすぎるグループは除外
+        enough_samples = (counts >= 3).to_numpy()
+        counts = counts[enough_samples]
+        means = means[enough_samples]
         
-        if not results:
+        if means.empty:
             logger.warning("No valid growth patterns could be calculated")
             return pd.DataFrame()
         
+        mean_values = means.to_numpy(dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # 成長率（現在のウィンドウ / 前のウィンドウ、前のウィンドウが0ならNaN）
+            prev_values = mean_values[:, :-1]
+            growth_rates = np.where(prev_values != 0, mean_values[:, 1:] / prev_values, np.nan)
+            
+            # 累積成長率（最初のウィンドウを基準とした相対値、基準が正でなければNaN）
+            base_values = mean_values[:, :1]
+            cumulative_growth = np.where(base_values > 0, mean_values / base_values, np.nan)
+        cumulative_growth[:, 0] = 1.0
+        
+        # 結果データを作成（グループ化列は先頭2列まで）
+        results = {
+            group_by[0]: means.index.get_level_values(0),
+            'count': counts.to_numpy()
+        }
+        if len(group_by) > 1:
+            results[group_by[1]] = means.index.get_level_values(1)
+        
+        # 各ウィンドウでの値と成長率を追加
+        for i, window in enumerate(windows):
+            results[f'{metric}_{window}min'] = mean_values[:, i]
+            if i > 0:
+                results[f'growth_{windows[i-1]}to{window}min'] = growth_rates[:, i - 1]
+        
+        for i, window in enumerate(windows):
+            results[f'cumulative_growth_{window}min'] = cumulative_growth[:, i]
+        
         # 結果をDataFrameに変換
         results_df = pd.DataFrame(results)
         
         # 小数点以下の桁数を制限
-        float_cols = [col for col in results_df.columns if results_df[col].dtype == 'float64']
-        for col in float_cols:
-            results_df[col] = results_df[col].round(4)
+        results_df = _round_floats(results_df)
         
         logger.info(f"Growth pattern analysis completed for {len(results_df)} groups")
         return results_df
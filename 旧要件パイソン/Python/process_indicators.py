@@ -16,16 +16,34 @@
 
 import os
 import sys
+import codecs
+import atexit
 import argparse
 import logging
+import logging.handlers
+import multiprocessing
+import numpy as np
 import pandas as pd
-from glob import glob
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Union, Any
 
+try:
+    import charset_normalizer
+except ImportError:
+    charset_normalizer = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    import pyarrow.dataset as pa_ds
+except ImportError:
+    pa = None
+
 # 独自モジュールのインポート
-from asymmetric_analysis import AsymmetricAnalyzer, batch_process_indicators
+from asymmetric_analysis import AsymmetricAnalyzer, batch_process_indicators, get_zigzag_time_column
 from statistical_processor import StatisticalProcessor
 
 # ロガーの設定
@@ -42,14 +60,26 @@ def setup_logging(log_level: str = 'INFO'):
     if not isinstance(numeric_level, int):
         numeric_level = logging.INFO
     
-    logging.basicConfig(
-        level=numeric_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(),  # コンソール出力
-            logging.FileHandler(f"indicator_processing_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")  # ファイル出力
-        ]
-    )
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [
+        logging.StreamHandler(),  # コンソール出力
+        logging.FileHandler(f"indicator_processing_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log",
+                            delay=True)  # ファイル出力（最初の書き込み時に開く）
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    # 書式化と書き込みはリスナーのバックグラウンドスレッドで行う
+    # （ワーカープロセスのログも受け取れるようにプロセス間キューを使う）
+    log_queue = multiprocessing.Queue(-1)
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    
+    logging.basicConfig(level=numeric_level, handlers=[queue_handler])
 
 def parse_arguments():
     """
@@ -70,6 +100,9 @@ def parse_arguments():
     parser.add_argument('--output_dir', type=str, default='../csv/Statistics/',
                         help='Directory to save output files')
     
+    parser.add_argument('--output_format', type=str, choices=['parquet', 'csv'],
+                        default='parquet', help='Output file format (default: parquet)')
+    
     # 分析パラメータ
     parser.add_argument('--pre_window', type=int, default=5,
                         help='Pre-event analysis window in minutes (default: 5)')
@@ -84,6 +117,10 @@ def parse_arguments():
     parser.add_argument('--classification_method', type=str, choices=['percentile', 'absolute'],
                         default='percentile', help='Method for volatility classification (default: percentile)')
     
+    # 並列処理
+    parser.add_argument('--n_jobs', type=int, default=-1,
+                        help='Number of worker processes for asymmetric analysis (-1: all cores, default: -1)')
+    
     # その他の設定
     parser.add_argument('--log_level', type=str, 
                         choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'],
@@ -91,6 +128,38 @@ def parse_arguments():
     
     return parser.parse_args()
 
+def detect_encoding(file_path: str, sample_size: int = 65536) -> Optional[str]:
+    """
+    ファイル先頭のバイト列から文字エンコーディングを推定する
+    
+    Args:
+        file_path: 対象ファイルのパス
+        sample_size: 推定に使用する先頭のバイト数
+        
+    Returns:
+        Optional[str]: 推定したエンコーディング名（推定できない場合はNone）
+    """
+    if charset_normalizer is None:
+        return None
+    
+    try:
+        with open(file_path, 'rb') as f:
+            sample = f.read(sample_size)
+    except OSError:
+        return None
+    
+    # マルチバイト文字の途中で切れないよう最後の改行までを使用
+    if len(sample) == sample_size and b'\n' in sample:
+        sample = sample[:sample.rfind(b'\n') + 1]
+    
+    best_match = charset_normalizer.from_bytes(sample).best()
+    if best_match is None:
+        return None
+    
+    # ASCIIのみの場合はUTF-8として扱う
+    encoding = codecs.lookup(best_match.encoding).name
+    return 'utf-8' if encoding == 'ascii' else encoding
+
 def load_indicator_data(file_path: str) -> pd.DataFrame:
     """
     経済指標データをCSVファイルから読み込む
@@ -105,7 +174,16 @@ def load_indicator_data(file_path: str) -> pd.DataFrame:
         logger.info(f"Loading indicator data from {file_path}")
         
         # エンコーディングの問題に対応するためにいくつかのエンコーディングを試す
+        # （推定できたエンコーディングが候補にあれば最初に試し、読み直しを避ける）
         encodings = ['utf-8', 'cp932', 'shift-jis', 'latin1']
+        detected = detect_encoding(file_path)
+        if detected is not None:
+            for encoding in encodings:
+                if codecs.lookup(encoding).name == detected:
+                    encodings.remove(encoding)
+                    encodings.insert(0, encoding)
+                    logger.debug("Detected indicator file encoding: %s", encoding)
+                    break
         df_indicators = None
         
         for encoding in encodings:
@@ -142,7 +220,12 @@ def load_zigzag_data(path: str) -> pd.DataFrame:
         # ディレクトリの場合は全ファイルを取得
         if os.path.isdir(path):
             logger.info(f"Loading ZigZag data from directory: {path}")
-            zigzag_files = glob(os.path.join(path, "mt5_zigzag_legs_*.csv"))
+            # DirEntryのキャッシュ済み情報を使い、ファイル名の前方・後方一致で絞り込む
+            with os.scandir(path) as entries:
+                zigzag_files = [entry.path for entry in entries
+                                if entry.name.startswith("mt5_zigzag_legs_")
+                                and entry.name.endswith(".csv")
+                                and entry.is_file()]
         else:
             # 単一ファイルの場合
             logger.info(f"Loading ZigZag data from file: {path}")
@@ -154,13 +237,32 @@ def load_zigzag_data(path: str) -> pd.DataFrame:
         
         logger.info(f"Found {len(zigzag_files)} ZigZag files")
         
+        # pyarrowが利用可能であれば全ファイルをまとめて並列に読み込む
+        if pa is not None:
+            try:
+                df_zigzag = _load_zigzag_arrow(zigzag_files)
+                logger.info(f"Loaded and combined {len(df_zigzag)} ZigZag records")
+                return df_zigzag
+            except (pa.ArrowException, OSError) as e:
+                logger.warning(f"pyarrowでの一括読み込みに失敗したため、ファイルごとに読み込みます: {e}")
+            
+            # ファイルごとにArrowテーブルとして読み込み、列の型をそろえながら結合する
+            table = _read_zigzag_tables(zigzag_files)
+            if table is None:
+                logger.error("No valid ZigZag data could be loaded")
+                return pd.DataFrame()
+            
+            df_zigzag = _zigzag_table_to_pandas(table)
+            logger.info(f"Loaded and combined {len(df_zigzag)} ZigZag records")
+            return df_zigzag
+        
         # 全ファイルを読み込んで結合
         df_list = []
         for file_path in zigzag_files:
             try:
                 df_temp = pd.read_csv(file_path, sep='\t')
                 df_list.append(df_temp)
-                logger.debug(f"Loaded {len(df_temp)} records from {file_path}")
+                logger.debug("Loaded %d records from %s", len(df_temp), file_path)
             except Exception as e:
                 logger.error(f"Error reading {file_path}: {e}")
                 continue
@@ -186,6 +288,101 @@ def load_zigzag_data(path: str) -> pd.DataFrame:
         logger.error(f"Error loading ZigZag data: {e}")
         return pd.DataFrame()
 
+def _load_zigzag_arrow(zigzag_files: List[str]) -> pd.DataFrame:
+    """
+    pyarrowのデータセットとして複数のZigZagファイルを一括で読み込む
+    
+    Args:
+        zigzag_files: ZigZagデータファイルのパスのリスト
+        
+    Returns:
+        DataFrame: 結合されたZigZagデータ（時間列を変換済み）
+    """
+    # タブ区切りで読み込む
+    parse_options = pa_csv.ParseOptions(delimiter='\t')
+    dataset = pa_ds.dataset(zigzag_files, format=pa_ds.CsvFileFormat(parse_options=parse_options))
+    
+    # 日時・日付として推論された列は文字列のまま読み込む（pandasでの読み込みと同じ型にする）
+    temporal_columns = {field.name: pa.string() for field in dataset.schema
+                        if pa.types.is_temporal(field.type)}
+    if temporal_columns:
+        file_format = pa_ds.CsvFileFormat(
+            parse_options=parse_options,
+            convert_options=pa_csv.ConvertOptions(column_types=temporal_columns)
+        )
+        dataset = pa_ds.dataset(zigzag_files, format=file_format)
+    
+    table = dataset.to_table(use_threads=True)
+    return _zigzag_table_to_pandas(table)
+
+def _read_zigzag_tables(zigzag_files: List[str]) -> Optional["pa.Table"]:
+    """
+    ZigZagファイルを1つずつArrowテーブルとして読み込み、1つのテーブルに結合する
+    
+    列の型がファイル間で異なる場合（整数と浮動小数点など）も、concat_tablesの
+    型昇格で結合する。pandasのDataFrameを経由しないため、結合時のコピーが発生しない。
+    
+    Args:
+        zigzag_files: ZigZagデータファイルのパスのリスト
+        
+    Returns:
+        pa.Table: 結合されたテーブル（読み込めたファイルがない場合はNone）
+    """
+    parse_options = pa_csv.ParseOptions(delimiter='\t')
+    tables = []
+    for file_path in zigzag_files:
+        try:
+            table = pa_csv.read_csv(file_path, parse_options=parse_options)
+            
+            # 日時・日付として推論された列は文字列として読み直す
+            temporal_columns = {field.name: pa.string() for field in table.schema
+                                if pa.types.is_temporal(field.type)}
+            if temporal_columns:
+                table = pa_csv.read_csv(
+                    file_path,
+                    parse_options=parse_options,
+                    convert_options=pa_csv.ConvertOptions(column_types=temporal_columns)
+                )
+            
+            tables.append(table)
+            logger.debug("Loaded %d records from %s", table.num_rows, file_path)
+        except (pa.ArrowException, OSError) as e:
+            logger.error(f"Error reading {file_path}: {e}")
+            continue
+    
+    if not tables:
+        return None
+    
+    return pa.concat_tables(tables, promote_options='permissive')
+
+def _zigzag_table_to_pandas(table: "pa.Table") -> pd.DataFrame:
+    """
+    ZigZagデータのArrowテーブルをDataFrameに変換し、時間列を追加する
+    
+    Args:
+        table: ZigZagデータのテーブル
+        
+    Returns:
+        DataFrame: 時間列を変換済みのZigZagデータ
+    """
+    # 秒単位のUNIX時間はArrow上でタイムスタンプに変換する
+    time_columns = {}
+    for source_col, target_col in [('start_time_utc_seconds', 'start_time_dt'),
+                                   ('end_time_utc_seconds', 'end_time_dt')]:
+        if source_col in table.column_names:
+            if pa.types.is_integer(table.schema.field(source_col).type):
+                table = table.append_column(target_col, pc.cast(table[source_col], pa.timestamp('s')))
+            else:
+                time_columns[source_col] = target_col
+    
+    df_zigzag = table.to_pandas(split_blocks=True, self_destruct=True)
+    
+    # 整数以外で読み込まれた時間列はpandasで変換
+    for source_col, target_col in time_columns.items():
+        df_zigzag[target_col] = pd.to_datetime(df_zigzag[source_col], unit='s')
+    
+    return df_zigzag
+
 def ensure_directory(directory_path: str) -> bool:
     """
     ディレクトリが存在することを確認し、必要に応じて作成する
@@ -206,6 +403,152 @@ def ensure_directory(directory_path: str) -> bool:
         logger.error(f"Failed to create directory {directory_path}: {e}")
         return False
 
+# ワーカープロセスで共有するZigZagデータとanalyzer（_init_batch_workerで一度だけ設定する）
+_worker_zigzag_df: Optional[pd.DataFrame] = None
+_worker_analyzer: Optional[AsymmetricAnalyzer] = None
+
+def _init_batch_worker(zigzag_df: pd.DataFrame, analyzer: AsymmetricAnalyzer) -> None:
+    """
+    ワーカープロセスの初期化時に、全グループで共通のデータを保持する
+    
+    Args:
+        zigzag_df: ZigZagデータのDataFrame
+        analyzer: AsymmetricAnalyzerインスタンス
+    """
+    global _worker_zigzag_df, _worker_analyzer
+    _worker_zigzag_df = zigzag_df
+    _worker_analyzer = analyzer
+
+def _batch_process_group(group_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    ワーカープロセスで1つの通貨グループを分析する
+    
+    Args:
+        group_df: 通貨グループの経済指標のDataFrame
+        
+    Returns:
+        DataFrame: 分析結果
+    """
+    return batch_process_indicators(group_df, _worker_zigzag_df, _worker_analyzer)
+
+def parallel_batch_process(indicators_df: pd.DataFrame,
+                           zigzag_df: pd.DataFrame,
+                           analyzer: AsymmetricAnalyzer,
+                           n_jobs: int = -1) -> pd.DataFrame:
+    """
+    通貨ごとに経済指標を分割し、非対称分析をプロセスプールで並列に実行する
+    
+    各指標の分析は互いに独立しているため、通貨単位のグループを別プロセスで
+    batch_process_indicatorsに渡し、結果を元の指標の並び順に戻して結合する。
+    
+    Args:
+        indicators_df: 経済指標のDataFrame
+        zigzag_df: ZigZagデータのDataFrame
+        analyzer: AsymmetricAnalyzerインスタンス
+        n_jobs: ワーカープロセス数（-1の場合はCPUコア数）
+        
+    Returns:
+        DataFrame: 分析結果
+    """
+    if 'Currency' in indicators_df.columns:
+        group_positions = list(indicators_df.groupby('Currency', sort=False, dropna=False).indices.values())
+    else:
+        group_positions = [np.arange(len(indicators_df))]
+    
+    max_workers = (os.cpu_count() or 1) if n_jobs < 1 else n_jobs
+    max_workers = min(max_workers, len(group_positions))
+    
+    if max_workers <= 1:
+        return batch_process_indicators(indicators_df, zigzag_df, analyzer)
+    
+    logger.info(f"Processing {len(group_positions)} currency groups with {max_workers} workers")
+    
+    # ZigZagデータとanalyzerはワーカーごとに一度だけ渡し、タスクでは通貨グループだけを送る
+    groups = [indicators_df.iloc[positions] for positions in group_positions]
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             initializer=_init_batch_worker,
+                             initargs=(zigzag_df, analyzer)) as executor:
+        group_results = list(executor.map(_batch_process_group, groups))
+    
+    # 通貨ごとの結果を元の指標の並び順に戻す
+    results_df = pd.concat(group_results, ignore_index=True)
+    order = np.argsort(np.concatenate(group_positions), kind='stable')
+    return results_df.iloc[order].reset_index(drop=True)
+
+def reduce_memory(df: pd.DataFrame, category_columns: Tuple[str, ...] = ('Currency', 'EventName')) -> pd.DataFrame:
+    """
+    集計前にデータ型を縮小してメモリ使用量を削減する
+    
+    浮動小数点列はfloat32へ、グループ化キーとなる低カーディナリティの文字列列は
+    category型へ変換する。列ごとの代入による再統合を避けるため、変換後の列を
+    辞書にまとめてから一度にDataFrameを構築する。
+    
+    Args:
+        df: 対象のDataFrame
+        category_columns: category型に変換する列名
+        
+    Returns:
+        DataFrame: データ型を縮小したDataFrame
+    """
+    if df.empty:
+        return df
+    
+    float_cols = set(df.select_dtypes(include='float').columns)
+    columns = {}
+    for col in df.columns:
+        if col in float_cols:
+            columns[col] = pd.to_numeric(df[col], downcast='float')
+        elif col in category_columns:
+            columns[col] = df[col].astype('category')
+        else:
+            columns[col] = df[col]
+    
+    reduced_df = pd.DataFrame(columns, index=df.index)
+    if logger.isEnabledFor(logging.DEBUG):
+        before_mb = df.memory_usage(deep=True).sum() / 1024 ** 2
+        after_mb = reduced_df.memory_usage(deep=True).sum() / 1024 ** 2
+        logger.debug("Reduced memory usage from %.1f MB to %.1f MB", before_mb, after_mb)
+    return reduced_df
+
+def write_parquet(df: pd.DataFrame, output_path: str, index: bool = False) -> None:
+    """
+    DataFrameをzstd圧縮のParquetファイルとして保存する
+    
+    Args:
+        df: 保存するDataFrame
+        output_path: 出力ファイルパス
+        index: インデックスを保存するかどうか
+    """
+    # 型が混在したobject列はArrowに変換できないため文字列にそろえる
+    # （pandas 3の既定の文字列型も明示的に含め、pandas 2と同じ列を選ぶ）
+    object_cols = df.select_dtypes(include=['object', 'string']).columns
+    if len(object_cols) > 0:
+        df = df.astype({col: 'string' for col in object_cols})
+    df.to_parquet(output_path, engine='pyarrow', compression='zstd', index=index)
+
+def save_results(df: pd.DataFrame, output_dir: str, base_name: str, output_format: str = 'parquet') -> str:
+    """
+    処理結果を指定された形式で保存する
+    
+    Args:
+        df: 保存するDataFrame
+        output_dir: 出力ディレクトリ
+        base_name: 拡張子を除いたファイル名
+        output_format: 出力形式（'parquet'または'csv'）
+        
+    Returns:
+        str: 保存したファイルのパス
+    """
+    output_path = os.path.join(output_dir, f"{base_name}.{output_format}")
+    
+    if output_format == 'csv':
+        # 目視確認用にCSV出力も選択できるようにする
+        df.to_csv(output_path, index=False)
+    else:
+        write_parquet(df, output_path, index=False)
+    
+    return output_path
+
 def main():
     """
     メイン処理関数
@@ -236,22 +579,33 @@ def main():
         logger.error("Failed to load ZigZag data, aborting")
         return 1
     
+    # ZigZagデータを一度だけ開始時刻順に並べ替え、指標ごとの抽出を二分探索で行えるようにする
+    # （時間列はextract_zigzag_windowと同じ規則で選ぶ）
+    zigzag_times = None
+    time_col = get_zigzag_time_column(zigzag_df)
+    if time_col is not None and pd.api.types.is_datetime64_any_dtype(zigzag_df[time_col]):
+        zigzag_df = zigzag_df.sort_values(time_col, kind='mergesort').reset_index(drop=True)
+        zigzag_times = zigzag_df[time_col].to_numpy(dtype='datetime64[ns]').view('i8')
+    
     # 発表後時間枠のリストを作成
     post_windows = [int(x.strip()) for x in args.post_windows.split(',')]
     
     # 非対称分析の実行
     logger.info("Running asymmetric analysis")
-    analyzer = AsymmetricAnalyzer(pre_window=args.pre_window, post_windows=post_windows)
-    analyzed_df = batch_process_indicators(indicators_df, zigzag_df, analyzer)
+    analyzer = AsymmetricAnalyzer(pre_window=args.pre_window, post_windows=post_windows,
+                                  zigzag_times=zigzag_times)
+    analyzed_df = parallel_batch_process(indicators_df, zigzag_df, analyzer, n_jobs=args.n_jobs)
     
     # 分析結果の保存
-    analyzed_output_path = os.path.join(args.output_dir, "analyzed_indicators.csv")
-    analyzed_df.to_csv(analyzed_output_path, index=False)
+    analyzed_output_path = save_results(analyzed_df, args.output_dir, "analyzed_indicators", args.output_format)
     logger.info(f"Saved analyzed indicators to {analyzed_output_path}")
     
     # 統計処理の対象列を設定
     target_column = f"post_{args.target_window}min_price_movement"
     
+    # 集計前にデータ型を縮小（保存済みの分析結果は元の精度のまま）
+    analyzed_df = reduce_memory(analyzed_df)
+    
     # 統計処理の実行
     logger.info("Running statistical processing")
     processor = StatisticalProcessor(min_samples=args.min_samples, target_column=target_column)
@@ -262,15 +616,13 @@ def main():
     
     # 統計結果の保存
     if not stats_df.empty:
-        stats_output_path = os.path.join(args.output_dir, "indicator_statistics.csv")
-        stats_df.to_csv(stats_output_path, index=False)
+        stats_output_path = save_results(stats_df, args.output_dir, "indicator_statistics", args.output_format)
         logger.info(f"Saved indicator statistics to {stats_output_path}")
     else:
         logger.error("Failed to generate indicator statistics")
     
     if not category_stats_df.empty:
-        category_output_path = os.path.join(args.output_dir, "category_statistics.csv")
-        category_stats_df.to_csv(category_output_path, index=False)
+        category_output_path = save_results(category_stats_df, args.output_dir, "category_statistics", args.output_format)
         logger.info(f"Saved category statistics to {category_output_path}")
     else:
         logger.error("Failed to generate category statistics")
@@ -18,9 +18,14 @@ import numpy as np
 import logging
 from typing import Dict, List, Optional, Tuple, Union, Any
 
+from fast_stats import iqr_outliers, zscore_outliers
+
 # ロガーの設定
 logger = logging.getLogger(__name__)
 
+# ボラティリティカテゴリ（小さい順）
+VOLATILITY_CATEGORIES = ["小", "中", "大"]
+
 class StatisticalProcessor:
     """
     指標データの統計処理を行うクラス
@@ -70,36 +75,33 @@ class StatisticalProcessor:
                 logger.error(f"Missing columns in dataframe: {missing_cols}")
                 return pd.DataFrame()
             
-            # ターゲット列の無効な値をフィルタリング
-            valid_data = analyzed_df.dropna(subset=[self.target_column])
-            logger.info(f"Valid data after dropping NaN: {len(valid_data)} records")
+            # 集計に必要なグループ列と対象列だけを取り出す（全列幅のdropnaは行わない）
+            target = self.target_column
+            valid_data = analyzed_df.loc[:, group_columns + [target]]
+            valid_mask = valid_data[target].notna()
+            logger.info(f"Valid data excluding NaN: {int(valid_mask.sum())} records")
             
-            # グループごとに統計量を計算
-            stats = valid_data.groupby(group_columns).agg({
-                self.target_column: [
-                    ('mean', 'mean'),
-                    ('median', 'median'),
-                    ('std', 'std'),
-                    ('min', 'min'),
-                    ('max', 'max'),
-                    ('count', 'count')
-                ]
-            })
+            # 有効値が最小サンプル数に満たないグループは集計前に除外（中央値・標準偏差などの計算を省く）
+            # 対象列の欠損行も同じマスクで落とし、グループの出現順を有効データ基準にそろえる
+            grouped = valid_data.groupby(group_columns, sort=False, observed=True)
+            group_counts = grouped[target].transform('count')
+            valid_data = valid_data[valid_mask & (group_counts >= self.min_samples)]
             
-            # マルチインデックスを解除
-            stats.columns = ['_'.join(col).strip() for col in stats.columns.values]
-            stats = stats.reset_index()
-            
-            # 最小サンプル数でフィルタリング
-            count_col = f"{self.target_column}_count"
-            stats_filtered = stats[stats[count_col] >= self.min_samples]
+            # グループごとに統計量を計算（名前付き集計で列名を直接生成、グループ順の並べ替えは省略）
+            stats_filtered = valid_data.groupby(group_columns, sort=False, observed=True).agg(**{
+                f"{target}_mean": (target, 'mean'),
+                f"{target}_median": (target, 'median'),
+                f"{target}_std": (target, 'std'),
+                f"{target}_min": (target, 'min'),
+                f"{target}_max": (target, 'max'),
+                f"{target}_count": (target, 'count')
+            }).reset_index()
             logger.info(f"Filtered statistics with at least {self.min_samples} samples: "
-                       f"{len(stats_filtered)} out of {len(stats)}")
+                       f"{len(stats_filtered)} out of {grouped.ngroups}")
             
             # 小数点以下の桁数を制限
-            float_cols = [col for col in stats_filtered.columns if stats_filtered[col].dtype == 'float64']
-            for col in float_cols:
-                stats_filtered[col] = stats_filtered[col].round(3)
+            float_cols = stats_filtered.select_dtypes(include='floating').columns
+            stats_filtered[float_cols] = stats_filtered[float_cols].round(3)
             
             return stats_filtered
             
@@ -142,15 +144,6 @@ class StatisticalProcessor:
                 
                 logger.info(f"Using percentile thresholds: q1={q1:.3f}, q2={q2:.3f}")
                 
-                # カテゴリ分類関数
-                def get_category(x):
-                    if x < q1:
-                        return "小"
-                    elif x < q2:
-                        return "中"
-                    else:
-                        return "大"
-                
             elif method == 'absolute':
                 # 絶対値に基づく分類
                 if self.category_thresholds is None:
@@ -160,22 +153,19 @@ class StatisticalProcessor:
                     q1, q2 = self.category_thresholds
                 
                 logger.info(f"Using absolute thresholds: q1={q1:.3f}, q2={q2:.3f}")
-                
-                # カテゴリ分類関数
-                def get_category(x):
-                    if x < q1:
-                        return "小"
-                    elif x < q2:
-                        return "中"
-                    else:
-                        return "大"
             
             else:
                 logger.error(f"Unknown classification method: {method}")
                 return stats_df
             
-            # カテゴリ列の追加
-            classified_df['Volatility_Category'] = classified_df[mean_col].apply(get_category)
+            # カテゴリ列の追加（q1未満は小、q2未満は中、それ以外（欠損値を含む）は大）
+            # q1 > q2 の場合は中に該当する値がないため、境界をq1に揃える
+            # （カテゴリ型で保持し、メモリ使用量とその後の集計コストを抑える）
+            bins = np.array([q1, max(q1, q2)])
+            classified_df['Volatility_Category'] = pd.Categorical.from_codes(
+                np.searchsorted(bins, classified_df[mean_col].to_numpy(dtype=np.float64), side='right'),
+                categories=VOLATILITY_CATEGORIES, ordered=True
+            )
             logger.info("Indicator classification completed")
             
             return classified_df
@@ -208,7 +198,7 @@ class StatisticalProcessor:
                 return pd.DataFrame()
             
             # カテゴリ別の統計量を計算
-            category_stats = classified_df.groupby('Volatility_Category').agg({
+            category_stats = classified_df.groupby('Volatility_Category', observed=True).agg({
                 mean_col: ['mean', 'min', 'max', 'count']
             })
             
@@ -217,9 +207,8 @@ class StatisticalProcessor:
             category_stats = category_stats.reset_index()
             
             # 小数点以下の桁数を制限
-            float_cols = [col for col in category_stats.columns if category_stats[col].dtype == 'float64']
-            for col in float_cols:
-                category_stats[col] = category_stats[col].round(3)
+            float_cols = category_stats.select_dtypes(include='floating').columns
+            category_stats[float_cols] = category_stats[float_cols].round(3)
             
             logger.info("Category statistics calculation completed")
             return category_stats
@@ -278,18 +267,16 @@ def calculate_percentiles(data_series: pd.Series,
     
     try:
         # 欠損値を除外
-        valid_data = data_series.dropna()
+        valid_data = data_series.dropna().to_numpy()
         
-        if len(valid_data) == 0:
+        if valid_data.size == 0:
             logger.warning("No valid data for percentile calculation")
             return {p: None for p in percentiles}
         
-        # パーセンタイルの計算
-        percentile_values = {}
-        for p in percentiles:
-            percentile_values[p] = valid_data.quantile(p)
+        # 一度のソートで全てのパーセンタイルを計算（pandasの既定と同じ線形補間）
+        percentile_values = np.quantile(valid_data, percentiles, method='linear')
         
-        return percentile_values
+        return dict(zip(percentiles, percentile_values.tolist()))
     
     except Exception as e:
         logger.error(f"Error calculating percentiles: {e}")
@@ -364,40 +351,30 @@ def detect_outliers(data_series: pd.Series,
         Series: 外れ値フラグ（True/False）の系列
     """
     try:
-        # 欠損値を除外
-        valid_data = data_series.dropna()
+        # 欠損値を除いた件数を確認（判定自体はJITコンパイルしたカーネルでndarray上で行う）
+        values = data_series.to_numpy(dtype=np.float64)
         
-        if len(valid_data) < 4:
+        if np.count_nonzero(~np.isnan(values)) < 4:
             logger.warning("Insufficient data for outlier detection")
             return pd.Series([False] * len(data_series), index=data_series.index)
         
         if method == 'iqr':
             # IQR法（四分位範囲）による外れ値検出
-            q1 = valid_data.quantile(0.25)
-            q3 = valid_data.quantile(0.75)
-            iqr = q3 - q1
-            
-            lower_bound = q1 - (threshold * iqr)
-            upper_bound = q3 + (threshold * iqr)
-            
-            outliers = (data_series < lower_bound) | (data_series > upper_bound)
+            outlier_mask = iqr_outliers(values, float(threshold))
             
         elif method == 'zscore':
             # Zスコア法による外れ値検出
-            mean = valid_data.mean()
-            std = valid_data.std()
+            outlier_mask, std = zscore_outliers(values, float(threshold))
             
             if std == 0:
                 logger.warning("Standard deviation is zero, cannot detect outliers using zscore method")
                 return pd.Series([False] * len(data_series), index=data_series.index)
             
-            zscores = (data_series - mean) / std
-            outliers = abs(zscores) > threshold
-            
         else:
             logger.error(f"Unknown outlier detection method: {method}")
             return pd.Series([False] * len(data_series), index=data_series.index)
         
+        outliers = pd.Series(outlier_mask, index=data_series.index, name=data_series.name, copy=False)
         return outliers
     
     except Exception as e:
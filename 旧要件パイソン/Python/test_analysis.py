@@ -8,19 +8,24 @@
 サンプルデータを生成または読み込み、各モジュールの主要な機能をテストします。
 """
 
+import io
 import os
 import sys
 import logging
+import functools
 import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from typing import Tuple
 
 # テスト対象のモジュールをインポート
 try:
     from asymmetric_analysis import AsymmetricAnalyzer, batch_process_indicators, extract_zigzag_window
     from statistical_processor import StatisticalProcessor, calculate_percentiles, detect_outliers
     from multiscale_analysis import MultiscaleAnalyzer, compare_time_windows
+    from fast_stats import quantile_sorted
 except ImportError as e:
     print(f"Error importing analysis modules: {e}")
     print("Make sure you're running this script from the Python directory.")
@@ -58,35 +63,29 @@ class TestDataGenerator:
             time_increment = timedelta(minutes=1)
         
         # 時間列の生成
-        times = [start_time + time_increment * i for i in range(num_points)]
-        times_utc_seconds = [int(t.timestamp()) for t in times]
+        times = pd.date_range(start=start_time, periods=num_points, freq=time_increment, unit='ns')
+        times_utc_seconds = times.asi8 // 10**9
         
         # ZigZag価格の生成
         np.random.seed(42)  # 再現性のために乱数シードを固定
         base_price = 1800.0  # 金価格の基準値
         
-        # ランダムな変動を追加
+        # ランダムな変動を累積して価格系列を作成
         price_changes = np.random.normal(0, 1, num_points)
-        prices = [base_price]
-        
-        for i in range(1, num_points):
-            # 前の価格に変動を追加
-            new_price = prices[-1] + price_changes[i]
-            prices.append(new_price)
+        price_changes[0] = 0.0
+        prices = base_price + np.cumsum(price_changes)
         
         # 前のポイントの価格と同じにならないように小さな調整を加える
-        for i in range(1, len(prices)):
-            if abs(prices[i] - prices[i-1]) < 0.1:
-                prices[i] += 0.1
+        prices[1:][np.abs(np.diff(prices)) < 0.1] += 0.1
         
-        # DataFrameを作成
+        # 型の決まった配列からDataFrameを作成（型推論とコピーを省く）
         df = pd.DataFrame({
             'start_time_utc_seconds': times_utc_seconds,
             'start_time_dt': times,
             'price': prices,
-            'leg_length': np.abs(np.diff(np.array(prices), prepend=prices[0])),
-            'is_high': [i % 2 == 0 for i in range(num_points)]  # 偶数インデックスを高値とする
-        })
+            'leg_length': np.abs(np.diff(prices, prepend=prices[0])),
+            'is_high': np.arange(num_points) % 2 == 0  # 偶数インデックスを高値とする
+        }, copy=False)
         
         return df
     
@@ -115,53 +114,133 @@ class TestDataGenerator:
             'Consumer Confidence'
         ]
         
-        data = []
-        for i in range(num_indicators):
-            # ランダムな通貨とイベントを選択
-            currency = currencies[i % len(currencies)]
-            event_name = event_names[i % len(event_names)]
-            
-            # 発表時刻（開始時刻から1時間ごと）
-            event_time = start_time + timedelta(hours=i)
-            
-            # 影響度（1-3）
-            impact = (i % 3) + 1
-            
-            # 予想値と実際値
-            forecast = np.random.normal(2.0, 0.5)
-            actual = forecast + np.random.normal(0, 0.3)
-            
-            # レコードを追加
-            data.append({
-                'ID': i + 1,
-                'Currency': currency,
-                'EventName': event_name,
-                'DateTime_UTC': event_time,
-                'Impact': impact,
-                'Forecast': round(forecast, 1),
-                'Actual': round(actual, 1),
-                'Surprise': round(actual - forecast, 1)
-            })
-        
-        return pd.DataFrame(data)
+        indices = np.arange(num_indicators)
+        
+        # 予想値と実際値（乱数はまとめて生成）
+        forecast = np.random.normal(2.0, 0.5, num_indicators)
+        actual = forecast + np.random.normal(0, 0.3, num_indicators)
+        
+        # 列ごとの配列から一度にDataFrameを作成
+        return pd.DataFrame({
+            'ID': indices + 1,
+            'Currency': np.array(currencies)[indices % len(currencies)],
+            'EventName': np.array(event_names)[indices % len(event_names)],
+            'DateTime_UTC': pd.Timestamp(start_time) + pd.to_timedelta(indices, unit='h'),  # 開始時刻から1時間ごと
+            'Impact': (indices % 3) + 1,  # 影響度（1-3）
+            'Forecast': np.round(forecast, 1),
+            'Actual': np.round(actual, 1),
+            'Surprise': np.round(actual - forecast, 1)
+        })
+
+@functools.lru_cache(maxsize=None)
+def _generate_zigzag_once(num_points: int) -> pd.DataFrame:
+    """
+    ZigZagデータを一度だけ生成する（呼び出し側には_cached_zigzagでコピーを渡す）
+    """
+    return TestDataGenerator.generate_zigzag_data(num_points)
+
+@functools.lru_cache(maxsize=None)
+def _generate_indicators_once(num_indicators: int, num_currencies: int) -> pd.DataFrame:
+    """
+    経済指標データを一度だけ生成する（呼び出し側には_cached_indicatorsでコピーを渡す）
+    """
+    return TestDataGenerator.generate_indicator_data(num_indicators, num_currencies)
+
+def _cached_zigzag(num_points: int = 200) -> pd.DataFrame:
+    """
+    テストプロセス内で一度だけ生成したZigZagデータのコピーを返す
+    （テスト側で変更されても他のテストクラスに影響しない）
+    
+    Args:
+        num_points: 生成するデータポイント数
+        
+    Returns:
+        DataFrame: 生成されたZigZagデータ
+    """
+    return _generate_zigzag_once(num_points).copy()
+
+def _cached_indicators(num_indicators: int = 10, num_currencies: int = 3) -> pd.DataFrame:
+    """
+    テストプロセス内で一度だけ生成した経済指標データのコピーを返す
+    （テスト側で変更されても他のテストクラスに影響しない）
+    
+    Args:
+        num_indicators: 生成する指標数
+        num_currencies: 通貨数
+        
+    Returns:
+        DataFrame: 生成された経済指標データ
+    """
+    return _generate_indicators_once(num_indicators, num_currencies).copy()
+
+def _quantiles(values: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """
+    JITコンパイルした分位点の計算（外れ値検出と同じquantile_sorted）で参照値を求める
+    
+    Args:
+        values: 欠損値を含まない値の配列
+        q: 分位（0〜1）の配列
+        
+    Returns:
+        ndarray: 各分位に対応する分位点
+    """
+    sorted_values = np.sort(values)
+    return np.array([quantile_sorted(sorted_values, p) for p in q])
+
+def setUpModule():
+    """
+    JITコンパイルされるカーネルを小さなデータで一度だけ実行し、各テストの計測からコンパイル時間を除く
+    """
+    # 一括分析の経路（ウィンドウ境界の計算を含む）
+    batch_process_indicators(TestDataGenerator.generate_indicator_data(1),
+                             TestDataGenerator.generate_zigzag_data(2),
+                             AsymmetricAnalyzer(pre_window=1, post_windows=[1]))
+    
+    # 統計処理のカーネル（テストと同じfloat64で特殊化させる）
+    values = np.arange(8, dtype=np.float64)
+    detect_outliers(pd.Series(values), method='iqr')
+    detect_outliers(pd.Series(values), method='zscore')
+    _quantiles(values, np.array([0.25, 0.5, 0.75]))
+    
+    # マルチスケール分析のカーネル
+    warmup_df = pd.DataFrame({f'post_{scale}min_price_movement': values for scale in (1, 2)})
+    MultiscaleAnalyzer(time_scales=[1, 2], reference_scale=2).calculate_scale_ratios(warmup_df)
 
 class TestAsymmetricAnalysis(unittest.TestCase):
     """
     AsymmetricAnalyzerのテスト
     """
     
+    @classmethod
+    def setUpClass(cls):
+        """
+        テスト用のデータをクラスで一度だけ準備
+        """
+        # テストデータの取得（全テストクラスで共有するキャッシュから）
+        cls.zigzag_df = _cached_zigzag(200)
+        cls.indicator_df = _cached_indicators(10)
+        
+        # 行単位のテストで使う指標行（Seriesを毎回生成しないようにNamedTupleで保持）
+        cls.indicator_rows = list(cls.indicator_df.itertuples(index=False))
+    
     def setUp(self):
         """
         テスト用のデータを準備
         """
-        # テストデータの生成
-        self.data_generator = TestDataGenerator()
-        self.zigzag_df = self.data_generator.generate_zigzag_data(200)
-        self.indicator_df = self.data_generator.generate_indicator_data(10)
-        
         # 分析インスタンスの作成
         self.analyzer = AsymmetricAnalyzer(pre_window=3, post_windows=[3, 10, 20])
     
+    def test_fixture_dtypes_are_native(self):
+        """
+        ZigZagデータの列がobject型ではなくネイティブ型で保持されているかのテスト
+        """
+        # 時刻列と高値フラグが固定長の型であること（object型への後退を検出）
+        self.assertEqual(self.zigzag_df['start_time_dt'].dtype, np.dtype('datetime64[ns]'))
+        self.assertEqual(self.zigzag_df['is_high'].dtype, np.bool_)
+        
+        # 全列が固定長の型であれば1行あたり64バイトに収まる
+        self.assertLess(self.zigzag_df.memory_usage(deep=True).sum(), len(self.zigzag_df) * 64)
+    
     def test_extract_zigzag_window(self):
         """
         extract_zigzag_window関数のテスト
@@ -179,20 +258,65 @@ class TestAsymmetricAnalysis(unittest.TestCase):
             self.assertTrue((window_data['start_time_dt'] >= start_time).all())
             self.assertTrue((window_data['start_time_dt'] <= end_time).all())
     
+    def test_extract_zigzag_window_keeps_input(self):
+        """
+        時間列が文字列の場合でもextract_zigzag_windowが入力データを変更しないかのテスト
+        """
+        zigzag_df = self.zigzag_df[['start_time_dt', 'price']].astype({'start_time_dt': str})
+        original_df = zigzag_df.copy()
+        start_time = self.zigzag_df['start_time_dt'].iloc[50]
+        end_time = self.zigzag_df['start_time_dt'].iloc[60]
+        
+        window_data = extract_zigzag_window(zigzag_df, start_time, end_time)
+        
+        # 入力は文字列のまま、抽出結果は時刻に変換された11行
+        pd.testing.assert_frame_equal(zigzag_df, original_df)
+        self.assertEqual(len(window_data), 11)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(window_data['start_time_dt']))
+    
+    def test_extract_zigzag_window_sorted_fastpath(self):
+        """
+        extract_zigzag_window関数の二分探索による抽出のテスト
+        """
+        # ZigZagデータ（時刻順に並んでいる）。数値の時刻列があってもdatetime型の列で抽出される
+        zigzag_df = self.zigzag_df
+        times = zigzag_df['start_time_dt']
+        times_arr = times.to_numpy(dtype='datetime64[ns]').view('i8')
+        
+        # ランダムな時間範囲で、全行比較による抽出結果と一致するか確認
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            lo, hi = np.sort(rng.integers(0, len(zigzag_df), size=2))
+            start_time = times.iloc[lo] - pd.Timedelta(seconds=int(rng.integers(0, 60)))
+            end_time = times.iloc[hi] + pd.Timedelta(seconds=int(rng.integers(0, 60)))
+            
+            expected = zigzag_df[(times >= start_time) & (times <= end_time)]
+            
+            window_data = extract_zigzag_window(zigzag_df, start_time, end_time)
+            pd.testing.assert_frame_equal(window_data, expected)
+            
+            window_data = extract_zigzag_window(zigzag_df, start_time, end_time, sorted_times=times_arr)
+            pd.testing.assert_frame_equal(window_data, expected)
+    
     def test_analyze_pre_event(self):
         """
         analyze_pre_event関数のテスト
         """
-        # 単一の指標レコードを選択
-        indicator_row = self.indicator_df.iloc[5]
-        
-        # 発表前分析を実行
-        results = self.analyzer.analyze_pre_event(indicator_row, self.zigzag_df)
+        # 単一の指標レコードをバッチ処理と同じ経路で分析
+        indicator_rows = self.indicator_df.iloc[[5]]
+        results_df = batch_process_indicators(indicator_rows, self.zigzag_df, self.analyzer)
         
         # 結果を検証
-        self.assertIsInstance(results, dict)
+        self.assertEqual(len(results_df), 1)
+        results = results_df.iloc[0].to_dict()
+        self.assertEqual(results['ID'], indicator_rows['ID'].iloc[0])
         self.assertIn('pre_event_valid', results)
         
+        # NamedTupleの指標行を直接渡しても同じ判定になるか確認
+        indicator_row = type(self).indicator_rows[5]
+        row_results = self.analyzer.analyze_pre_event(indicator_row, self.zigzag_df)
+        self.assertEqual(row_results['pre_event_valid'], results['pre_event_valid'])
+        
         # テスト用に価格変動データを追加（StatisticalProcessorのテスト用）
         if not results.get('pre_event_valid', False):
             results['price_movement'] = 0.05
@@ -201,21 +325,140 @@ class TestAsymmetricAnalysis(unittest.TestCase):
         """
         analyze_post_event関数のテスト
         """
-        # 単一の指標レコードを選択
-        indicator_row = self.indicator_df.iloc[5]
-        
-        # 発表後分析を実行
-        results = self.analyzer.analyze_post_event(indicator_row, self.zigzag_df)
+        # 単一の指標レコードをバッチ処理と同じ経路で分析
+        indicator_rows = self.indicator_df.iloc[[5]]
+        results_df = batch_process_indicators(indicator_rows, self.zigzag_df, self.analyzer)
         
         # 結果を検証
-        self.assertIsInstance(results, dict)
+        self.assertEqual(len(results_df), 1)
+        results = results_df.iloc[0].to_dict()
+        self.assertEqual(results['ID'], indicator_rows['ID'].iloc[0])
         self.assertIn('post_event_valid', results)
         
+        # NamedTupleの指標行を直接渡しても同じ判定になるか確認
+        indicator_row = type(self).indicator_rows[5]
+        row_results = self.analyzer.analyze_post_event(indicator_row, self.zigzag_df)
+        self.assertEqual(row_results['post_event_valid'], results['post_event_valid'])
+        for window in self.analyzer.post_windows:
+            self.assertEqual(row_results[f'post_{window}min_valid'], results[f'post_{window}min_valid'])
+        
         # テスト用に価格変動データを追加（StatisticalProcessorとMultiscaleAnalyzerのテスト用）
         post_windows = self.analyzer.post_windows
         for window in post_windows:
             results[f'post_{window}min_price_movement'] = 0.01 * window
     
+    def _analyze_rows(self, indicator_df: pd.DataFrame, zigzag_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        指標ごとに時刻で抽出して分析する（計算済みの範囲を使わない比較用の結果）
+        
+        Args:
+            indicator_df: 経済指標のDataFrame
+            zigzag_df: ZigZagデータのDataFrame
+            
+        Returns:
+            DataFrame: 分析結果
+        """
+        return pd.DataFrame([self.analyzer.analyze_indicator(row, zigzag_df)
+                             for _, row in indicator_df.iterrows()])
+    
+    def test_batch_process_window_bounds(self):
+        """
+        計算済みのウィンドウ範囲による抽出のテスト
+        """
+        # ZigZagデータと、その時刻配列（数値の時刻列も残したまま、datetime型の列から作成）
+        zigzag_df = self.zigzag_df
+        zigzag_times = zigzag_df['start_time_dt'].to_numpy(dtype='datetime64[ns]').view('i8')
+        
+        # 指標の発表時刻をZigZagデータの期間内に配置
+        event_times = zigzag_df['start_time_dt'].iloc[10] + pd.to_timedelta(np.arange(len(self.indicator_df)) * 17, unit='min')
+        indicator_df = self.indicator_df.assign(DateTime_UTC=event_times)
+        
+        # 範囲を一括計算した場合と、指標ごとに時刻で抽出した場合の結果が一致するか確認
+        analyzer = AsymmetricAnalyzer(pre_window=3, post_windows=[3, 10, 20], zigzag_times=zigzag_times)
+        results_df = batch_process_indicators(indicator_df, zigzag_df, analyzer)
+        expected_df = self._analyze_rows(indicator_df, zigzag_df)
+        
+        self.assertTrue(results_df['pre_event_valid'].any())
+        pd.testing.assert_frame_equal(results_df, expected_df)
+        
+        # 時刻配列を渡さない場合も、時刻順のデータでは同じ範囲で抽出される
+        pd.testing.assert_frame_equal(batch_process_indicators(indicator_df, zigzag_df, self.analyzer), expected_df)
+        
+        # 時刻配列と対応しないZigZagデータには計算済みの範囲を適用しない
+        with self.assertRaises(ValueError):
+            batch_process_indicators(indicator_df, zigzag_df.iloc[1:], analyzer)
+        window_bounds = analyzer.compute_window_bounds(indicator_df['DateTime_UTC'])
+        with self.assertRaises(ValueError):
+            analyzer._extract_window(zigzag_df.iloc[1:], None, None, 'pre', 0, window_bounds)
+    
+    def test_batch_process_window_bounds_bad_event_time(self):
+        """
+        変換できない発表時刻を含む指標データでも、バッチ全体が止まらないかのテスト
+        """
+        zigzag_df = self.zigzag_df
+        zigzag_times = zigzag_df['start_time_dt'].to_numpy(dtype='datetime64[ns]').view('i8')
+        analyzer = AsymmetricAnalyzer(pre_window=3, post_windows=[3, 10, 20], zigzag_times=zigzag_times)
+        
+        # 文字列の発表時刻に、不正な値と書式の異なる値（一括変換ではNaTになる）を1件ずつ混ぜる
+        event_times = zigzag_df['start_time_dt'].iloc[10] + pd.to_timedelta(np.arange(len(self.indicator_df)) * 17, unit='min')
+        event_strings = event_times.strftime('%Y-%m-%d %H:%M:%S').to_numpy(dtype=object)
+        event_strings[2] = 'not a date'
+        event_strings[4] = event_times[4].strftime('%Y/%m/%d %H:%M')
+        indicator_df = self.indicator_df.assign(DateTime_UTC=event_strings)
+        
+        results_df = batch_process_indicators(indicator_df, zigzag_df, analyzer)
+        
+        # 不正な行だけが無効になり、他の行は指標ごとに時刻で抽出した場合と一致する
+        self.assertEqual(len(results_df), len(indicator_df))
+        self.assertFalse(results_df['pre_event_valid'].iloc[2])
+        self.assertTrue(results_df['pre_event_valid'].iloc[4])
+        pd.testing.assert_frame_equal(results_df, self._analyze_rows(indicator_df, zigzag_df))
+    
+    def test_batch_process_window_bounds_tz_aware_events(self):
+        """
+        タイムゾーン付きの発表時刻で、時刻配列の有無によって結果が変わらないかのテスト
+        """
+        zigzag_df = self.zigzag_df
+        zigzag_times = zigzag_df['start_time_dt'].to_numpy(dtype='datetime64[ns]').view('i8')
+        
+        # タイムゾーンなしのZigZagデータに、オフセット付きの文字列とtz付きの時刻をそれぞれ渡す
+        event_times = zigzag_df['start_time_dt'].iloc[10] + pd.to_timedelta(np.arange(len(self.indicator_df)) * 17, unit='min')
+        event_strings = event_times.strftime('%Y-%m-%d %H:%M:%S+00:00').to_numpy(dtype=object)
+        for events in (event_strings, event_times.tz_localize('UTC')):
+            indicator_df = self.indicator_df.assign(DateTime_UTC=events)
+            
+            with_times = batch_process_indicators(
+                indicator_df, zigzag_df,
+                AsymmetricAnalyzer(pre_window=3, post_windows=[3, 10, 20], zigzag_times=zigzag_times))
+            without_times = batch_process_indicators(
+                indicator_df, zigzag_df, AsymmetricAnalyzer(pre_window=3, post_windows=[3, 10, 20]))
+            
+            pd.testing.assert_frame_equal(with_times, without_times)
+            pd.testing.assert_frame_equal(with_times, self._analyze_rows(indicator_df, zigzag_df))
+    
+    def test_batch_process_window_bounds_reused_analyzer(self):
+        """
+        同じanalyzerで異なる指標データを続けて処理した場合のテスト（前回の範囲を再利用しないこと）
+        """
+        zigzag_df = self.zigzag_df
+        zigzag_times = zigzag_df['start_time_dt'].to_numpy(dtype='datetime64[ns]').view('i8')
+        analyzer = AsymmetricAnalyzer(pre_window=3, post_windows=[3, 10, 20], zigzag_times=zigzag_times)
+        
+        # 発表時刻の異なる2つの指標データ
+        offsets = pd.to_timedelta(np.arange(len(self.indicator_df)) * 17, unit='min')
+        first_df = self.indicator_df.assign(DateTime_UTC=zigzag_df['start_time_dt'].iloc[10] + offsets)
+        second_df = self.indicator_df.iloc[::-1].assign(DateTime_UTC=zigzag_df['start_time_dt'].iloc[40] + offsets)
+        
+        for indicator_df in (first_df, second_df):
+            results_df = batch_process_indicators(indicator_df, zigzag_df, analyzer)
+            expected_df = self._analyze_rows(indicator_df, zigzag_df)
+            pd.testing.assert_frame_equal(results_df, expected_df)
+        
+        # バッチ処理後に位置だけを指定しても、直前の指標データの範囲ではなく時刻による抽出になる
+        row = first_df.iloc[0]
+        self.assertEqual(analyzer.analyze_indicator(row, zigzag_df, 0),
+                         self.analyzer.analyze_indicator(row, zigzag_df))
+    
     def test_batch_process_indicators(self):
         """
         batch_process_indicators関数のテスト
@@ -232,30 +475,36 @@ class TestAsymmetricAnalysis(unittest.TestCase):
         
         # テスト用に価格変動データを追加
         post_windows = self.analyzer.post_windows
+        positions = np.arange(1, len(results_df) + 1)
         for window in post_windows:
-            results_df[f'post_{window}min_price_movement'] = [0.01 * window * (i + 1) for i in range(len(results_df))]
+            results_df[f'post_{window}min_price_movement'] = 0.01 * window * positions
 
 class TestStatisticalProcessor(unittest.TestCase):
     """
     StatisticalProcessorのテスト
     """
     
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """
-        テスト用のデータを準備
+        テスト用のデータと分析結果をクラスで一度だけ準備
         """
         # テストデータの生成
-        self.data_generator = TestDataGenerator()
-        self.zigzag_df = self.data_generator.generate_zigzag_data(200)
-        self.indicator_df = self.data_generator.generate_indicator_data(20, num_currencies=4)
+        cls.zigzag_df = _cached_zigzag(200)
+        cls.indicator_df = _cached_indicators(20, num_currencies=4)
         
         # テスト用の分析結果を生成
         analyzer = AsymmetricAnalyzer(pre_window=3, post_windows=[3, 10])
-        self.analyzed_df = batch_process_indicators(self.indicator_df, self.zigzag_df, analyzer)
+        cls.analyzed_df = batch_process_indicators(cls.indicator_df, cls.zigzag_df, analyzer)
         
         # テスト用に価格変動データを追加
-        self.analyzed_df['post_10min_price_movement'] = [0.1 * (i % 5 + 1) for i in range(len(self.analyzed_df))]
-        
+        n = len(cls.analyzed_df)
+        cls.analyzed_df['post_10min_price_movement'] = 0.1 * ((np.arange(n) % 5) + 1)
+    
+    def setUp(self):
+        """
+        テスト用のデータを準備
+        """
         # 統計処理インスタンスの作成
         self.processor = StatisticalProcessor(min_samples=2, target_column='post_10min_price_movement')
     
@@ -275,6 +524,34 @@ class TestStatisticalProcessor(unittest.TestCase):
         for col in expected_columns:
             self.assertIn(col, stats_df.columns)
     
+    def test_calculate_indicator_statistics_int_key(self):
+        """
+        2列のグループキーを1つの整数キーに符号化した場合のcalculate_indicator_statisticsのテスト
+        """
+        # 通貨と指標名をカテゴリコードに変換し、通貨コード×指標名の種類数＋指標名コードで1つのint64キーにまとめる
+        currency = self.analyzed_df['Currency'].astype('category')
+        event_name = self.analyzed_df['EventName'].astype('category')
+        num_events = len(event_name.cat.categories)
+        keyed_df = self.analyzed_df.assign(
+            __key__=currency.cat.codes.astype(np.int64) * num_events + event_name.cat.codes.astype(np.int64)
+        )
+        
+        # 整数キーと2列のキーでそれぞれ統計量を計算
+        key_stats = self.processor.calculate_indicator_statistics(keyed_df, group_columns=['__key__'])
+        expected = self.processor.calculate_indicator_statistics(self.analyzed_df)
+        self.assertEqual(key_stats['__key__'].dtype, np.int64)
+        
+        # 整数キーを通貨と指標名に復元して比較
+        codes = key_stats.pop('__key__').to_numpy()
+        decoded = pd.concat([
+            pd.DataFrame({
+                'Currency': currency.cat.categories[codes // num_events],
+                'EventName': event_name.cat.categories[codes % num_events]
+            }),
+            key_stats
+        ], axis=1)
+        pd.testing.assert_frame_equal(decoded, expected, check_dtype=False)
+    
     def test_classify_indicators(self):
         """
         classify_indicators関数のテスト
@@ -304,9 +581,11 @@ class TestStatisticalProcessor(unittest.TestCase):
         # 結果を検証
         self.assertIsInstance(percentiles, dict)
         self.assertEqual(len(percentiles), 3)
-        self.assertAlmostEqual(percentiles[0.25], 3.25, delta=0.01)
-        self.assertAlmostEqual(percentiles[0.5], 5.5, delta=0.01)
-        self.assertAlmostEqual(percentiles[0.75], 7.75, delta=0.01)
+        np.testing.assert_allclose(list(percentiles.values()), [3.25, 5.5, 7.75], atol=0.01)
+        
+        # JITコンパイルした参照実装と一致するか確認
+        expected = _quantiles(data_series.to_numpy(dtype=np.float64), np.array([0.25, 0.5, 0.75]))
+        np.testing.assert_allclose(list(percentiles.values()), expected)
     
     def test_detect_outliers(self):
         """
@@ -322,29 +601,46 @@ class TestStatisticalProcessor(unittest.TestCase):
         self.assertIsInstance(outliers, pd.Series)
         self.assertEqual(len(outliers), len(data_series))
         self.assertTrue(outliers.iloc[5])  # インデックス5が外れ値として検出されるはず
+        
+        # pandasの分位点で求めた境界による判定と一致するか確認
+        rng = np.random.default_rng(0)
+        for _ in range(10):
+            values = pd.Series(np.concatenate([rng.normal(0, 1, 200), rng.normal(0, 10, 5)]))
+            outliers = detect_outliers(values, method='iqr', threshold=1.5)
+            q1, q3 = values.quantile([0.25, 0.75])
+            expected = (values < q1 - 1.5 * (q3 - q1)) | (values > q3 + 1.5 * (q3 - q1))
+            self.assertTrue(np.array_equal(outliers.values, expected.values))
 
 class TestMultiscaleAnalysis(unittest.TestCase):
     """
     MultiscaleAnalyzerのテスト
     """
     
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """
-        テスト用のデータを準備
+        テスト用のデータと分析結果をクラスで一度だけ準備
         """
         # テストデータの生成
-        self.data_generator = TestDataGenerator()
-        self.zigzag_df = self.data_generator.generate_zigzag_data(200)
-        self.indicator_df = self.data_generator.generate_indicator_data(15, num_currencies=3)
+        cls.zigzag_df = _cached_zigzag(200)
+        cls.indicator_df = _cached_indicators(15, num_currencies=3)
         
         # テスト用の分析結果を生成
         analyzer = AsymmetricAnalyzer(pre_window=3, post_windows=[5, 15, 30])
-        self.analyzed_df = batch_process_indicators(self.indicator_df, self.zigzag_df, analyzer)
+        cls.analyzed_df = batch_process_indicators(cls.indicator_df, cls.zigzag_df, analyzer)
         
         # テスト用に価格変動データを追加
         time_scales = [5, 15, 30]
+        n = len(cls.analyzed_df)
         for scale in time_scales:
-            self.analyzed_df[f'post_{scale}min_price_movement'] = [0.01 * scale * (i % 5 + 1) for i in range(len(self.analyzed_df))]
+            cls.analyzed_df[f'post_{scale}min_price_movement'] = 0.01 * scale * ((np.arange(n) % 5) + 1)
+    
+    def setUp(self):
+        """
+        テスト用のデータを準備
+        """
+        # 分析で列が追加されるため、テストごとに分析結果のコピーを使う
+        self.analyzed_df = type(self).analyzed_df.copy()
         
         # マルチスケール分析インスタンスの作成
         self.analyzer = MultiscaleAnalyzer(time_scales=[5, 15, 30], reference_scale=15)
@@ -364,6 +660,44 @@ class TestMultiscaleAnalysis(unittest.TestCase):
         self.assertIn('scale_ratio_5_to_15', result_df.columns)
         self.assertIn('scale_ratio_30_to_15', result_df.columns)
     
+    def _one_scale(self, scale: int, scale_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        1つのスケールの比率列だけを計算する（スケールごとの部分計算）
+        
+        Args:
+            scale: 対象の時間スケール（分）
+            scale_df: 対象スケール列と基準スケール列だけを含むデータフレーム
+            
+        Returns:
+            DataFrame: 対象スケールの比率列（基準スケール自身は空）
+        """
+        reference_scale = self.analyzer.reference_scale
+        if scale == reference_scale:
+            return pd.DataFrame(index=scale_df.index)
+        
+        scale_analyzer = MultiscaleAnalyzer(time_scales=[scale, reference_scale], reference_scale=reference_scale)
+        result_df = scale_analyzer.calculate_scale_ratios(scale_df)
+        return result_df.drop(columns=scale_df.columns)
+    
+    def test_calculate_scale_ratios_parallel(self):
+        """
+        スケールごとに分割して並列計算した比率が一括計算と一致するかのテスト
+        """
+        # 各スケールの比率は自身の列と基準列だけに依存するため、スケール単位で並列に計算できる
+        ref_col = f'post_{self.analyzer.reference_scale}min_price_movement'
+        time_scales = self.analyzer.time_scales
+        with ThreadPoolExecutor(max_workers=len(time_scales)) as executor:
+            results = list(executor.map(
+                lambda s: self._one_scale(s, self.analyzed_df[list(dict.fromkeys([f'post_{s}min_price_movement', ref_col]))]),
+                time_scales
+            ))
+        combined = pd.concat(results, axis=1)
+        
+        # 一括計算の結果と比較
+        expected = self.analyzer.calculate_scale_ratios(self.analyzed_df)
+        self.assertEqual(len(combined.columns), 2 * (len(time_scales) - 1))
+        pd.testing.assert_frame_equal(combined, expected[combined.columns])
+    
     def test_calculate_scale_correlations(self):
         """
         calculate_scale_correlations関数のテスト
@@ -391,36 +725,55 @@ class TestMultiscaleAnalysis(unittest.TestCase):
         for col in expected_columns:
             self.assertIn(col, results.columns)
 
+def _run_test_class(class_name: str) -> Tuple[str, int, int, int]:
+    """
+    1つのテストクラスを実行する（プロセスプールのワーカー用）
+    
+    Args:
+        class_name: 実行するテストクラスの名前
+        
+    Returns:
+        Tuple[str, int, int, int]: (テスト出力, 実行数, エラー数, 失敗数)
+    """
+    test_class = getattr(sys.modules[__name__], class_name)
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    
+    # 出力が混ざらないように、結果は文字列として親プロセスに返す
+    stream = io.StringIO()
+    runner = unittest.TextTestRunner(stream=stream, verbosity=2)
+    result = runner.run(suite)
+    
+    return stream.getvalue(), result.testsRun, len(result.errors), len(result.failures)
+
 def run_tests():
     """
     全テストを実行する
     """
     logger.info("Starting analysis module tests")
     
-    # テスト対象のクラスを取得
-    test_classes = [
-        TestAsymmetricAnalysis,
-        TestStatisticalProcessor,
-        TestMultiscaleAnalysis
-    ]
+    # モジュール内のテストを収集し、テストクラスの名前を取得（クラスを追加しても一覧の編集は不要）
+    suite = unittest.defaultTestLoader.loadTestsFromModule(sys.modules[__name__])
+    class_names = [next(iter(class_suite)).__class__.__name__
+                   for class_suite in suite if class_suite.countTestCases() > 0]
     
-    # テストスイートを作成
-    loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
+    # 各テストクラスは互いに独立しているため、プロセスプールで並列に実行
+    max_workers = min(len(class_names), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        class_results = list(executor.map(_run_test_class, class_names))
     
-    for test_class in test_classes:
-        suite.addTests(loader.loadTestsFromTestCase(test_class))
-    
-    # テストの実行
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
+    tests_run = errors = failures = 0
+    for output, class_tests_run, class_errors, class_failures in class_results:
+        sys.stderr.write(output)
+        tests_run += class_tests_run
+        errors += class_errors
+        failures += class_failures
     
     # 結果の表示
-    logger.info(f"Tests run: {result.testsRun}")
-    logger.info(f"Errors: {len(result.errors)}")
-    logger.info(f"Failures: {len(result.failures)}")
+    logger.info(f"Tests run: {tests_run}")
+    logger.info(f"Errors: {errors}")
+    logger.info(f"Failures: {failures}")
     
-    return len(result.errors) + len(result.failures)
+    return errors + failures
 
 if __name__ == "__main__":
     sys.exit(run_tests()) 
\ No newline at end of file